@@ -0,0 +1,125 @@
+import threading
+from collections import Counter
+
+# Compliance aggregates per framework and chapter: score sums, evaluated
+# counts and a histogram of statuses (Cumple, Observación, No conformidad
+# menor / mayor, ...).
+#
+# A framework's aggregates are built from the database once, then kept up to
+# date from the store's change feed (see storage.py): saving a score
+# subtracts the control's old record and adds the new one, O(1) whatever the
+# size of the framework.  A reset from the feed or a new framework version
+# drops them and the next read builds them again.
+
+PENDING_STATUS = 'Pendiente'
+
+
+def contribution(record, pending):
+    # (score or None, status) of one control record.  Controls without a
+    # record, or only mapped so far (status in pending), are not evaluated.
+    status = record.get('status') if record else None
+    if not status or status in pending:
+        return None, PENDING_STATUS
+    return record.get('score', 0), status
+
+
+class Tally:
+    def __init__(self, controls):
+        self.controls = controls
+        self.evaluated = 0
+        self.score_sum = 0
+        self.statuses = Counter({PENDING_STATUS: controls})
+
+    def move(self, old, new):
+        old_score, old_status = old
+        new_score, new_status = new
+        if old_score is not None:
+            self.evaluated -= 1
+            self.score_sum -= old_score
+        if new_score is not None:
+            self.evaluated += 1
+            self.score_sum += new_score
+        self.statuses[old_status] -= 1
+        self.statuses[new_status] += 1
+
+    def as_dict(self):
+        return {
+            'controls': self.controls,
+            'evaluated': self.evaluated,
+            'score_sum': self.score_sum,
+            # Average over evaluated controls; compliance counts the rest as 0
+            'mean': round(self.score_sum / self.evaluated, 1) if self.evaluated else None,
+            'compliance': round(self.score_sum / self.controls, 1) if self.controls else None,
+            'statuses': {status: count for status, count in self.statuses.items() if count}
+        }
+
+
+class FrameworkSummary:
+    def __init__(self, catalog, db_controls):
+        self.catalog = catalog
+        self.version = catalog.version
+        self.pending = {PENDING_STATUS, catalog.settings['mapped_status']}
+        self.total = Tally(len(catalog))
+        self.chapters = {chapter: Tally(end - start) for chapter, (start, end) in catalog.chapter_ranges.items()}
+        for control_id, record in db_controls.items():
+            self.apply(control_id, None, record)
+
+    def apply(self, control_id, old, new):
+        entry = self.catalog.get(control_id)
+        if entry is None:
+            return  # not part of the framework (anymore)
+        old, new = contribution(old, self.pending), contribution(new, self.pending)
+        self.total.move(old, new)
+        self.chapters[entry.chapter].move(old, new)
+
+    def as_dict(self):
+        return dict(self.total.as_dict(), framework=self.catalog.name, chapters=[
+            dict(self.chapters[chapter].as_dict(), chapter=chapter, title=self.catalog.chapter_titles[chapter])
+            for chapter in self.catalog.chapters])
+
+
+class ComplianceAnalytics:
+    def __init__(self, store, frameworks):
+        self.store = store
+        self.frameworks = frameworks
+        self._lock = threading.Lock()
+        self._summaries = {}
+        # Bumped on every change so a build racing with a write is not kept
+        self._changes = 0
+        self.builds = 0
+        self.updates = 0
+        store.listeners.append(self.control_changed)
+
+    def control_changed(self, framework, control_id, old, new):
+        with self._lock:
+            self._changes += 1
+            if framework is None:
+                self._summaries.clear()
+            elif control_id is None:
+                self._summaries.pop(framework, None)
+            elif framework in self._summaries:
+                self._summaries[framework].apply(control_id, old, new)
+                self.updates += 1
+
+    def summary(self, framework):
+        # {'controls', 'evaluated', 'score_sum', 'mean', 'compliance',
+        #  'statuses', 'chapters': [...]} or None for an unknown framework.
+        catalog = self.frameworks.get(framework)
+        if catalog is None:
+            return None
+        self.store.sync()
+        with self._lock:
+            summary = self._summaries.get(framework)
+            if summary is not None and summary.catalog is catalog and summary.version == catalog.version:
+                return summary.as_dict()
+            changes = self._changes
+        # Built outside the lock: reading the store may deliver feed events.
+        summary = FrameworkSummary(catalog, self.store.controls(framework))
+        with self._lock:
+            self.builds += 1
+            if self._changes == changes:
+                self._summaries[framework] = summary
+            return summary.as_dict()
+
+    def stats(self):
+        return {'builds': self.builds, 'updates': self.updates, 'frameworks': len(self._summaries)}
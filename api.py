@@ -0,0 +1,250 @@
+import base64
+import gzip
+import hashlib
+import json
+from datetime import datetime, timezone
+
+from flask import Blueprint, jsonify, request, session
+
+try:
+    import brotli
+except ImportError:  # gzip only
+    brotli = None
+
+# Versioned JSON API for integrations (/api/v1/...).
+#
+# Lists are paged with opaque cursors (?cursor= from the previous page's
+# next_cursor, ?limit= up to MAX_PAGE_LIMIT), accept ?fields=a,b for sparse
+# fieldsets, and carry weak ETag and Last-Modified validators derived from the
+# tenant, the catalog version and the store's revision, so a conditional GET
+# (If-None-Match) for unchanged data is answered with 304 before anything is
+# read.  Last-Modified only has one-second precision, so If-Modified-Since is
+# never enough on its own: every response has an ETag to revalidate with.  Bodies larger than
+# COMPRESS_MIN_BYTES are sent brotli or gzip encoded when the client accepts it.
+
+DEFAULT_PAGE_LIMIT = 100
+MAX_PAGE_LIMIT = 1000
+COMPRESS_MIN_BYTES = 1024
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+PENDING_STATUS = 'Pendiente'
+FRAMEWORK_FIELDS = ('name', 'title', 'version', 'controls', 'chapters')
+CONTROL_FIELDS = ('id', 'chapter', 'control', 'title', 'content', 'documents', 'score', 'status', 'comment')
+DOCUMENT_FIELDS = ('name', 'sha256', 'size', 'pages', 'uploaded')
+
+
+class ApiError(Exception):
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+
+def encode_cursor(value):
+    return base64.urlsafe_b64encode(json.dumps(value).encode()).decode().rstrip('=')
+
+
+def decode_cursor(text):
+    try:
+        return json.loads(base64.urlsafe_b64decode(text + '=' * (-len(text) % 4)))
+    except ValueError:
+        raise ApiError('invalid cursor')
+
+
+def page_limit():
+    limit = request.args.get('limit', DEFAULT_PAGE_LIMIT, type=int)
+    return max(1, min(limit, MAX_PAGE_LIMIT))
+
+
+def selected_fields(allowed):
+    if 'fields' not in request.args:
+        return allowed
+    fields = [field.strip() for field in request.args['fields'].split(',') if field.strip()]
+    unknown = [field for field in fields if field not in allowed]
+    if unknown:
+        raise ApiError(f"unknown fields: {', '.join(unknown)}")
+    return fields
+
+
+def conditional(tenant, tag, modified, build):
+    # 304 when the client's ETag still matches; otherwise the JSON of build().
+    etag = hashlib.sha1(f'v1|{tenant}|{tag}|{request.path}|{request.query_string.decode()}'.encode()).hexdigest()
+    last_modified = datetime.fromtimestamp(int(modified), timezone.utc) if modified else None
+    not_modified = bool(request.if_none_match) and request.if_none_match.contains_weak(etag)
+    response = jsonify() if not_modified else jsonify(build())
+    if not_modified:
+        response.status_code = 304
+        response.set_data(b'')
+    response.set_etag(etag, weak=True)
+    if last_modified is not None:
+        response.last_modified = last_modified
+    response.cache_control.private = True
+    response.cache_control.no_cache = True
+    response.vary.add('Cookie')
+    return response
+
+
+def compress(response):
+    response.vary.add('Accept-Encoding')
+    if (response.status_code != 200 or response.direct_passthrough or 'Content-Encoding' in response.headers
+            or (response.content_length or 0) < COMPRESS_MIN_BYTES):
+        return response
+    encoding = request.accept_encodings.best_match(['br', 'gzip'] if brotli is not None else ['gzip'])
+    if encoding == 'br':
+        response.set_data(brotli.compress(response.get_data(), quality=BROTLI_QUALITY))
+    elif encoding == 'gzip':
+        response.set_data(gzip.compress(response.get_data(), compresslevel=GZIP_LEVEL))
+    else:
+        return response
+    response.headers['Content-Encoding'] = encoding
+    return response
+
+
+def create_api(store, frameworks, tenant_name):
+    # tenant_name(): the current request's organization, part of every ETag
+    api = Blueprint('api_v1', __name__, url_prefix='/api/v1')
+
+    @api.before_request
+    def require_login():
+        if 'username' not in session:
+            return jsonify(error='login required'), 401
+
+    api.after_request(compress)
+
+    @api.errorhandler(ApiError)
+    def api_error(e):
+        return jsonify(error=str(e)), e.status
+
+    def catalog_for():
+        name = request.args.get('framework')
+        if not name:
+            raise ApiError('framework is required')
+        catalog = frameworks.get(name)
+        if catalog is None:
+            raise ApiError(f'unknown framework: {name}', 404)
+        return catalog
+
+    def control_filter(catalog):
+        # Predicate on (entry, record) from ?status= (repeatable), ?min_score=,
+        # ?max_score= and ?chapter=
+        statuses = set(request.args.getlist('status'))
+        min_score = request.args.get('min_score', type=int)
+        max_score = request.args.get('max_score', type=int)
+        chapter = request.args.get('chapter')
+        if chapter is not None and chapter not in catalog.chapter_titles:
+            raise ApiError(f'unknown chapter: {chapter}')
+
+        def matches(entry, record):
+            if chapter is not None and (entry is None or entry.chapter != chapter):
+                return False
+            if statuses and (record.get('status') or PENDING_STATUS) not in statuses:
+                return False
+            score = record.get('score')
+            if min_score is not None and (score is None or score < min_score):
+                return False
+            if max_score is not None and (score is None or score > max_score):
+                return False
+            return True
+        return matches
+
+    def control_item(catalog, control_id, record, fields):
+        entry = catalog.get(control_id)
+        item = {
+            'id': control_id,
+            'chapter': entry.chapter if entry else None,
+            'control': entry.control if entry else None,
+            'title': entry.title if entry else record.get('title'),
+            'content': entry.content if entry else '',
+            'documents': list(record.get('documents', ())),
+            'score': record.get('score'),
+            'status': record.get('status') or PENDING_STATUS,
+            'comment': record.get('comment')
+        }
+        return {field: item[field] for field in fields}
+
+    def control_page(catalog, control_ids, records, fields):
+        # Catalog order (unknown ids last, by id), resuming after the cursor's id.
+        end = len(catalog)
+
+        def key(control_id):
+            return catalog.positions.get(control_id, end), control_id
+        ordered = sorted(control_ids, key=key)
+        if 'cursor' in request.args:
+            after = decode_cursor(request.args['cursor'])
+            if not isinstance(after, str):
+                raise ApiError('invalid cursor')
+            after = key(after)
+            ordered = [control_id for control_id in ordered if key(control_id) > after]
+        matches = control_filter(catalog)
+        limit = page_limit()
+        items = []
+        last = None
+        for control_id in ordered:
+            record = records.get(control_id) or {}
+            if not matches(catalog.get(control_id), record):
+                continue
+            if len(items) == limit:
+                break
+            items.append(control_item(catalog, control_id, record, fields))
+            last = control_id
+        else:
+            last = None
+        return {'framework': catalog.name, 'items': items,
+                'next_cursor': encode_cursor(last) if last is not None else None}
+
+    @api.route('/frameworks')
+    def list_frameworks():
+        fields = selected_fields(FRAMEWORK_FIELDS)
+        catalogs = [frameworks[name] for name in frameworks.names()]
+
+        def build():
+            items = []
+            for catalog in catalogs:
+                item = {'name': catalog.name, 'title': catalog.title, 'version': catalog.version,
+                        'controls': len(catalog),
+                        'chapters': [{'chapter': chapter, 'title': catalog.chapter_titles[chapter]}
+                                     for chapter in catalog.chapters]}
+                items.append({field: item[field] for field in fields})
+            return {'items': items}
+        return conditional(tenant_name(), [(catalog.name, catalog.version) for catalog in catalogs], None, build)
+
+    @api.route('/controls')
+    def list_controls():
+        # Every control of the framework with its current evaluation
+        catalog = catalog_for()
+        fields = selected_fields(CONTROL_FIELDS)
+        revision, modified = store.revision()
+        return conditional(tenant_name(), (catalog.name, catalog.version, revision), modified,
+                           lambda: control_page(catalog, catalog.ids, store.controls(catalog.name), fields))
+
+    @api.route('/evaluations')
+    def list_evaluations():
+        # Only the controls with a stored record (mapped or evaluated)
+        catalog = catalog_for()
+        fields = selected_fields(CONTROL_FIELDS)
+        revision, modified = store.revision()
+
+        def build():
+            records = store.controls(catalog.name)
+            return control_page(catalog, list(records), records, fields)
+        return conditional(tenant_name(), (catalog.name, catalog.version, revision), modified, build)
+
+    @api.route('/documents')
+    def list_documents():
+        fields = selected_fields(DOCUMENT_FIELDS)
+        after = decode_cursor(request.args['cursor']) if 'cursor' in request.args else 0
+        if not isinstance(after, int):
+            raise ApiError('invalid cursor')
+        revision, modified = store.revision()
+
+        def build():
+            limit = page_limit()
+            rows = store.documents_page(after, limit + 1)
+            items = []
+            for position, name, info in rows[:limit]:
+                item = dict(info or {}, name=name)
+                items.append({field: item.get(field) for field in fields})
+            return {'items': items,
+                    'next_cursor': encode_cursor(rows[limit - 1][0]) if len(rows) > limit else None}
+        return conditional(tenant_name(), revision, modified, build)
+
+    return api
@@ -0,0 +1,75 @@
+"""Compliance summary cost: rebuilding the aggregates from every control record
+vs keeping them current from the store's change feed, on a synthetic framework.
+
+    python benchmarks/bench_analytics.py --controls 5000
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+
+from analytics import ComplianceAnalytics, FrameworkSummary  # noqa: E402
+from catalog import FrameworkRegistry  # noqa: E402
+from storage import open_store  # noqa: E402
+
+STATUSES = ((100, 'Cumple'), (80, 'Observación'), (50, 'No conformidad menor'), (10, 'No conformidad mayor'))
+
+
+def ms(seconds):
+    return round(seconds * 1e3, 3)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--controls', type=int, default=5000)
+    parser.add_argument('--chapters', type=int, default=50)
+    parser.add_argument('--backend', default='json', choices=('json', 'sqlite'))
+    parser.add_argument('--writes', type=int, default=200)
+    args = parser.parse_args()
+
+    work = tempfile.mkdtemp()
+    per_chapter = args.controls // args.chapters
+    chapters = {f'C.{c}': {'title': f'Capítulo {c}', 'controls': {
+        f'C.{c}.{i}': {'title': f'Control {c}.{i}'} for i in range(per_chapter)}} for c in range(args.chapters)}
+    os.makedirs(os.path.join(work, 'frameworks'))
+    with open(os.path.join(work, 'frameworks', 'synthetic.json'), 'w') as f:
+        json.dump({'version': '1', 'chapters': chapters}, f)
+    frameworks = FrameworkRegistry(os.path.join(work, 'frameworks'))
+    catalog = frameworks['synthetic']
+
+    store = open_store(args.backend, os.path.join(work, 'database.json' if args.backend == 'json' else 'database.sqlite3'))
+    rng = random.Random(1)
+    store.update(lambda db: db.setdefault('synthetic_controls', {}).update({
+        control_id: dict(zip(('score', 'status'), rng.choice(STATUSES))) for control_id in catalog.ids}))
+    analytics = ComplianceAnalytics(store, frameworks)
+
+    results = {'controls': len(catalog), 'backend': args.backend}
+    start = time.perf_counter()
+    for _ in range(20):
+        FrameworkSummary(catalog, store.controls('synthetic')).as_dict()
+    results['recompute_summary_ms'] = ms((time.perf_counter() - start) / 20)
+
+    analytics.summary('synthetic')
+    start = time.perf_counter()
+    for _ in range(args.writes):
+        score, status = rng.choice(STATUSES)
+        store.update_control('synthetic', rng.choice(catalog.ids), {'score': score, 'status': status})
+    results['save_score_ms'] = ms((time.perf_counter() - start) / args.writes)
+
+    start = time.perf_counter()
+    for _ in range(200):
+        summary = analytics.summary('synthetic')
+    results['incremental_summary_ms'] = ms((time.perf_counter() - start) / 200)
+    assert summary == FrameworkSummary(catalog, store.controls('synthetic')).as_dict()
+    results['analytics'] = analytics.stats()
+    print(json.dumps(results, indent=4))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,54 @@
+"""What an integration pays to keep a copy of the ISO evaluations: the old
+scrape of the audit page vs /api/v1 pages (plain, sparse, compressed) and
+conditional re-fetches of unchanged data.
+
+    python benchmarks/bench_api.py
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+os.chdir(tempfile.mkdtemp())  # importing app creates uploads/ and the database in the cwd
+
+import app as audit_app  # noqa: E402
+
+RUNS = 50
+
+
+def measure(client, url, headers=None):
+    start = time.perf_counter()
+    for _ in range(RUNS):
+        response = client.get(url, headers=headers or {})
+    return {'ms': round((time.perf_counter() - start) / RUNS * 1e3, 3), 'bytes': len(response.data),
+            'status': response.status_code}
+
+
+def main():
+    catalog = audit_app.frameworks['iso']
+    audit_app.update_db(lambda db: db.setdefault('controls', {}).update({
+        control_id: {'title': catalog.control_title(control_id), 'documents': ['a.pdf'], 'score': 80,
+                     'status': 'Observación', 'comment': 'Revisado ' * 10} for control_id in catalog.ids}))
+    client = audit_app.app.test_client()
+    with client.session_transaction() as session:
+        session['username'] = 'auditor'
+        session['role'] = 'auditor'
+
+    url = '/api/v1/controls?framework=iso&limit=1000'
+    full = client.get(url)
+    results = {
+        'audit_page_scrape': measure(client, '/audit'),
+        'api_full': measure(client, url),
+        'api_sparse': measure(client, url + '&fields=id,score,status'),
+        'api_gzip': measure(client, url, {'Accept-Encoding': 'gzip'}),
+        'api_brotli': measure(client, url, {'Accept-Encoding': 'br'}),
+        'api_if_none_match': measure(client, url, {'If-None-Match': full.headers['ETag']})
+    }
+    print(json.dumps(results, indent=4))
+
+
+if __name__ == '__main__':
+    main()
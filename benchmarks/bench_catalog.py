@@ -0,0 +1,82 @@
+"""Per-request cost of control lookups: nested framework walk vs FrameworkCatalog,
+plus the cost of loading a framework from its data file or pickle cache.
+
+    python benchmarks/bench_catalog.py
+"""
+import json
+import os
+import sys
+import tempfile
+import timeit
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+os.chdir(tempfile.mkdtemp())  # importing app creates uploads/ and the database in the cwd
+
+from app import frameworks  # noqa: E402
+from catalog import FrameworkRegistry  # noqa: E402
+
+CATALOGS = {name: frameworks[name] for name in ('iso', 'ecuador')}
+ISO_CONTROLS = CATALOGS['iso'].tree
+ECUADOR_LAW_CONTROLS = CATALOGS['ecuador'].tree
+
+
+def nested_title(control):
+    for section in ISO_CONTROLS.values():
+        for ctrl in section['controls'].values():
+            if control in ctrl.get('subcontrols', {}):
+                return ctrl['subcontrols'][control]
+    return None
+
+
+def nested_rows(tree):
+    rows = []
+    for chapter, chapter_data in tree.items():
+        for control_id, control_details in chapter_data['controls'].items():
+            if 'subcontrols' in control_details:
+                for subcontrol_id, title in control_details['subcontrols'].items():
+                    rows.append((subcontrol_id, title))
+            else:
+                rows.append((f"{chapter}_{control_id}", control_details['title']))
+    return rows
+
+
+def catalog_rows(catalog):
+    return [(entry.id, entry.title) for entry in catalog]
+
+
+def bench(fn, number):
+    return round(min(timeit.repeat(fn, number=number, repeat=5)) / number * 1e6, 3)
+
+
+def main():
+    last_iso = CATALOGS['iso'].ids[-1]
+    results = {
+        'iso_title_lookup_us': {
+            'nested': bench(lambda: nested_title(last_iso), 2000),
+            'catalog': bench(lambda: CATALOGS['iso'].control_title(last_iso), 2000),
+        },
+        'iso_rows_us': {
+            'nested': bench(lambda: nested_rows(ISO_CONTROLS), 500),
+            'catalog': bench(lambda: catalog_rows(CATALOGS['iso']), 500),
+        },
+        'ecuador_rows_us': {
+            'nested': bench(lambda: nested_rows(ECUADOR_LAW_CONTROLS), 500),
+            'catalog': bench(lambda: catalog_rows(CATALOGS['ecuador']), 500),
+        },
+        'ecuador_chapter_slice_us': {
+            'nested': bench(lambda: [r for r in nested_rows(ECUADOR_LAW_CONTROLS) if r[0].startswith('CAP.6_')], 500),
+            'catalog': bench(lambda: CATALOGS['ecuador'].chapter_ids['CAP.6'], 500),
+        },
+    }
+    registry = FrameworkRegistry(frameworks.directory, cache_dir=tempfile.mkdtemp())
+    results['load_ms'] = {
+        'data_file': round(min(timeit.repeat(lambda: registry._load('ecuador', registry._sources['ecuador']) and os.remove(
+            os.path.join(registry.cache_dir, 'ecuador.pickle')), number=1, repeat=5)) * 1e3, 3),
+        'pickle_cache': bench(lambda: registry._load('ecuador', registry._sources['ecuador']), 20) / 1e3,
+    }
+    print(json.dumps(results, indent=4))
+
+
+if __name__ == '__main__':
+    main()
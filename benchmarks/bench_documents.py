@@ -0,0 +1,83 @@
+"""Document listings on the home and upload pages: the whole 'documents' list
+vs one sorted, filtered page of the document catalog, plus what an upload and
+a mapping change cost to keep the catalog current.
+
+    python benchmarks/bench_documents.py --documents 20000
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+
+from jinja2 import Template  # noqa: E402
+
+from catalog import FrameworkRegistry  # noqa: E402
+from documents import DocumentCatalog  # noqa: E402
+from storage import open_store  # noqa: E402
+
+RUNS = 50
+
+
+def ms(seconds):
+    return round(seconds * 1e3, 3)
+
+
+def timed(fn, runs=RUNS):
+    start = time.perf_counter()
+    for _ in range(runs):
+        fn()
+    return ms((time.perf_counter() - start) / runs)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--documents', type=int, default=20000)
+    parser.add_argument('--backend', default='json', choices=('json', 'sqlite'))
+    args = parser.parse_args()
+
+    work = tempfile.mkdtemp()
+    store = open_store(args.backend, os.path.join(work, 'database.json' if args.backend == 'json' else 'database.sqlite3'))
+    frameworks = FrameworkRegistry(os.path.join(ROOT, 'frameworks'), cache_dir=os.path.join(work, 'cache'))
+    rng = random.Random(1)
+    now = time.time()
+    store.add_document_files({f'evidencia_{i:06d}.pdf': {
+        'sha256': f'{i:064x}', 'size': rng.randint(10_000, 5_000_000), 'pages': rng.randint(1, 80),
+        'uploaded': now - rng.uniform(0, 86400 * 365)} for i in range(args.documents)})
+    ids = frameworks['iso'].ids
+    store.update(lambda db: db.setdefault('controls', {}).update({
+        control_id: {'documents': [f'evidencia_{rng.randrange(args.documents):06d}.pdf' for _ in range(3)],
+                     'status': 'Mapeado'} for control_id in ids}))
+
+    results = {'documents': args.documents, 'backend': args.backend}
+    start = time.perf_counter()
+    catalog = DocumentCatalog(os.path.join(work, 'documents.sqlite3'), store, frameworks)
+    results['seed_ms'] = ms(time.perf_counter() - start)
+    full_list = Template('{% for document in documents %}<li class="list-group-item">{{ document }}</li>{% endfor %}')
+    results['full_list_render_ms'] = timed(lambda: full_list.render(documents=store.documents()))
+    results['full_list_bytes'] = len(full_list.render(documents=store.documents()).encode())
+    results['page_newest_ms'] = timed(lambda: catalog.page({}, 'uploaded', 0, 25))
+    results['page_by_name_deep_ms'] = timed(lambda: catalog.page({}, 'name', args.documents // 2, 25))
+    results['page_largest_ms'] = timed(lambda: catalog.page({}, 'size', 0, 25))
+    results['page_name_contains_ms'] = timed(lambda: catalog.page({'q': '1234'}, 'uploaded', 0, 25))
+    results['page_linked_ms'] = timed(lambda: catalog.page({'linked': 'yes'}, 'uploaded', 0, 25))
+    results['page_unlinked_ms'] = timed(lambda: catalog.page({'linked': 'no'}, 'uploaded', 0, 25))
+
+    counter = iter(range(10 ** 9))
+    results['add_upload_ms'] = timed(lambda: catalog.add({f'nuevo_{next(counter)}.pdf': {
+        'sha256': 'f' * 64, 'size': 1000, 'pages': 1, 'uploaded': time.time()}}, 'user'))
+    results['score_change_ms'] = timed(lambda: store.update_control('iso', rng.choice(ids),
+                                                                  {'score': rng.randint(0, 100)}))
+    results['mapping_change_ms'] = timed(lambda: store.update_control('iso', rng.choice(ids), {
+        'documents': [f'evidencia_{rng.randrange(args.documents):06d}.pdf']}))
+    results['catalog'] = catalog.stats()
+    print(json.dumps(results, indent=4))
+
+
+if __name__ == '__main__':
+    main()
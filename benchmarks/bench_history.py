@@ -0,0 +1,76 @@
+"""Audit history queries: state as of a date and one control's score trend,
+answered from snapshots and indexes vs replaying the whole change log.
+
+    python benchmarks/bench_history.py --changes 50000
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+
+from history import AuditHistory, apply_delta  # noqa: E402
+from storage import open_store  # noqa: E402
+
+STATUSES = ((100, 'Cumple'), (80, 'Observación'), (50, 'No conformidad menor'), (10, 'No conformidad mayor'))
+
+
+def ms(seconds):
+    return round(seconds * 1e3, 3)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--changes', type=int, default=50000)
+    parser.add_argument('--controls', type=int, default=114)
+    args = parser.parse_args()
+
+    work = tempfile.mkdtemp()
+    history = AuditHistory(os.path.join(work, 'history.sqlite3'), open_store('json', os.path.join(work, 'database.json')))
+    rng = random.Random(1)
+    controls = [f'A.{i}' for i in range(args.controls)]
+    current = {}
+
+    results = {'writes': args.changes}
+    first = time.time()
+    start = time.perf_counter()
+    for _ in range(args.changes):
+        control_id = rng.choice(controls)
+        score, status = rng.choice(STATUSES)
+        new = {'score': score, 'status': status, 'comment': f'c{score}'}
+        history.record('iso', [(control_id, current.get(control_id), new)], 'bench')
+        current[control_id] = new
+    results['record_change_ms'] = ms((time.perf_counter() - start) / args.changes)
+
+    times = [rng.uniform(first, time.time()) for _ in range(50)]
+    start = time.perf_counter()
+    for when in times:
+        history.state_at('iso', when)
+    results['state_at_ms'] = ms((time.perf_counter() - start) / len(times))
+
+    conn = history._conn()
+    start = time.perf_counter()
+    for when in times[:5]:
+        state = {}
+        for row in conn.execute('SELECT framework, control_id, changed, delta FROM changes ORDER BY id'):
+            if row['framework'] == 'iso' and row['changed'] <= when:
+                apply_delta(state, row['control_id'], json.loads(row['delta']))
+    results['state_at_full_replay_ms'] = ms((time.perf_counter() - start) / 5)
+    assert state == history.state_at('iso', times[4])
+
+    start = time.perf_counter()
+    for control_id in controls[:50]:
+        history.trend('iso', control_id)
+    results['trend_ms'] = ms((time.perf_counter() - start) / 50)
+    results.update(history.stats())
+    results['db_bytes'] = os.path.getsize(os.path.join(work, 'history.sqlite3'))
+    print(json.dumps(results, indent=4))
+
+
+if __name__ == '__main__':
+    main()
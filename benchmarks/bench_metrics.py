@@ -0,0 +1,86 @@
+"""What the metrics cost: one histogram observation, a timed() block, the
+request hooks on a cheap page (against the page itself) and a /metrics scrape
+with every route's series and other workers' files to add up.
+
+    python benchmarks/bench_metrics.py
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+os.chdir(tempfile.mkdtemp())  # importing app creates the default tenant in the cwd
+os.environ['METRICS_FOLDER'] = os.path.join(os.getcwd(), 'metrics')
+os.environ['METRICS_TOKEN'] = 'bench'
+
+import app as audit_app  # noqa: E402
+from metrics import timed  # noqa: E402
+
+RUNS = 100000
+REQUESTS = 2000
+WORKERS = 8
+
+
+def us(seconds, runs):
+    return round(seconds / runs * 1e6, 3)
+
+
+def main():
+    histogram = audit_app.request_seconds
+    start = time.perf_counter()
+    for i in range(RUNS):
+        histogram.observe(0.003, '/bench', 'GET', '200')
+    observe = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for i in range(RUNS):
+        with timed('bench'):
+            pass
+    timed_block = time.perf_counter() - start
+
+    client = audit_app.app.test_client()
+    hooks = audit_app.app.before_request_funcs[None], audit_app.app.after_request_funcs[None]
+    bare = ([f for f in hooks[0] if f is not audit_app.start_request_timer],
+            [f for f in hooks[1] if f is not audit_app.record_request_time])
+    elapsed = {'with': 0.0, 'without': 0.0}
+    client.get('/login')
+    # Alternating rounds, so drift (GC, caches) hits both alike
+    for _ in range(10):
+        for variant, (before, after) in (('with', hooks), ('without', bare)):
+            audit_app.app.before_request_funcs[None], audit_app.app.after_request_funcs[None] = before, after
+            start = time.perf_counter()
+            for i in range(REQUESTS // 10):
+                client.get('/login')
+            elapsed[variant] += time.perf_counter() - start
+    audit_app.app.before_request_funcs[None], audit_app.app.after_request_funcs[None] = hooks
+
+    # Every route with a few statuses, as other workers would have published them
+    for rule in audit_app.app.url_map.iter_rules():
+        for status in ('200', '302', '404'):
+            histogram.observe(0.01, rule.rule, 'GET', status)
+    for pid in range(WORKERS):
+        audit_app.metrics._write(audit_app.metrics._path(10 ** 6 + pid),
+                                 audit_app.metrics._dump({name: h.snapshot()
+                                                          for name, h in audit_app.metrics.histograms.items()}))
+    runs = 50
+    start = time.perf_counter()
+    for i in range(runs):
+        body = client.get('/metrics', headers={'Authorization': 'Bearer bench'}).data
+    scrape = time.perf_counter() - start
+
+    print(json.dumps({
+        'observe_us': us(observe, RUNS),
+        'timed_block_us': us(timed_block, RUNS),
+        'request_with_hooks_us': us(elapsed['with'], REQUESTS),
+        'request_without_hooks_us': us(elapsed['without'], REQUESTS),
+        'scrape_ms': round(scrape / runs * 1e3, 3),
+        'scrape_bytes': len(body),
+        'scrape_workers': WORKERS + 1
+    }, indent=4))
+
+
+if __name__ == '__main__':
+    main()
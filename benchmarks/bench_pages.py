@@ -0,0 +1,77 @@
+"""Initial page weight and time to first byte of the mapping and audit pages as
+a synthetic framework grows, paginated vs everything rendered in one page.
+
+    python benchmarks/bench_pages.py --sizes 100 1000 5000
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+work = tempfile.mkdtemp()
+os.makedirs(os.path.join(work, 'frameworks'))
+os.environ['FRAMEWORKS_FOLDER'] = os.path.join(work, 'frameworks')
+os.chdir(work)  # importing app creates uploads/ and the database in the cwd
+
+RUNS = 10
+PER_CHAPTER = 25
+
+
+def synthetic(size):
+    chapters = {f'C.{c}': {'title': f'Capítulo {c}', 'controls': {
+        f'C.{c}.{i}': {'title': f'Control {c}.{i}', 'content': 'Requisito del control ' * 8}
+        for i in range(PER_CHAPTER)}} for c in range(size // PER_CHAPTER)}
+    name = f'synthetic{size}'
+    with open(os.path.join(work, 'frameworks', f'{name}.json'), 'w') as f:
+        json.dump({'version': '1', 'chapters': chapters}, f)
+    return name
+
+
+def measure(client, url):
+    client.get(url)  # first use of a framework loads its catalog and builds its suggestions
+    start = time.perf_counter()
+    for _ in range(RUNS):
+        response = client.get(url)
+    assert response.status_code == 200, url
+    return {'ms': round((time.perf_counter() - start) / RUNS * 1e3, 3), 'bytes': len(response.data)}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100, 1000, 5000])
+    args = parser.parse_args()
+    names = [synthetic(size) for size in args.sizes]
+
+    import app as audit_app
+    mapper, auditor = audit_app.app.test_client(), audit_app.app.test_client()
+    for client, role in ((mapper, 'user'), (auditor, 'auditor')):
+        with client.session_transaction() as session:
+            session['username'] = role
+            session['role'] = role
+
+    results = {}
+    for size, name in zip(args.sizes, names):
+        catalog = audit_app.frameworks[name]
+        audit_app.update_db(lambda db: db.setdefault(f'{name}_controls', {}).update({
+            control_id: {'title': catalog.control_title(control_id), 'documents': ['a.pdf'], 'score': 80,
+                         'status': 'Observación', 'comment': 'Revisado'} for control_id in catalog.ids}))
+        row = {
+            'map_page': measure(mapper, f'/map_controls_{name}'),
+            'chapter_fragment': measure(mapper, f'/map_controls_{name}/chapters/C.0'),
+            'audit_page': measure(auditor, f'/audit_{name}'),
+            'audit_more_fragment': measure(auditor, f'/audit_{name}/controls?page=2')
+        }
+        paged = audit_app.CONTROLS_PER_PAGE, audit_app.CHAPTERS_PER_PAGE
+        audit_app.CONTROLS_PER_PAGE = audit_app.CHAPTERS_PER_PAGE = size
+        row['audit_page_unpaginated'] = measure(auditor, f'/audit_{name}')
+        audit_app.CONTROLS_PER_PAGE, audit_app.CHAPTERS_PER_PAGE = paged
+        results[size] = row
+    print(json.dumps(results, indent=4))
+
+
+if __name__ == '__main__':
+    main()
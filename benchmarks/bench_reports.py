@@ -0,0 +1,98 @@
+"""Render time and peak RSS of the PDF report against the number of rows.
+
+Builds a synthetic framework (chapters of --chapter-size controls, every one
+evaluated with a long comment) and renders it with reports.build_report, each
+size in a fresh process so ru_maxrss is that render's peak.  --single-table
+also renders the old layout (the whole audit as one reportlab Table, with the
+same wrapped cells) for comparison; it gets slow quickly, so it is capped at
+--single-table-max rows.
+
+    python benchmarks/bench_reports.py --rows 1000 5000 10000
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import resource
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from catalog import FrameworkCatalog  # noqa: E402
+import reports  # noqa: E402
+
+COMMENT = ('El control se encuentra implementado parcialmente; se revisaron las evidencias '
+           'entregadas y se recomienda completar la documentación del procedimiento. ') * 4
+
+
+def synthetic_audit(rows, chapter_size):
+    tree = {}
+    db_controls = {}
+    for i in range(rows):
+        chapter = f'C.{i // chapter_size + 1}'
+        chapter_data = tree.setdefault(chapter, {'title': f'Capítulo {chapter}', 'controls': {}})
+        control_id = f'{chapter}.{i % chapter_size + 1}'
+        chapter_data['controls'][control_id] = {'title': f'Control {control_id}',
+                                                'subcontrols': {control_id + '.1': f'Subcontrol {control_id}'}}
+        db_controls[control_id + '.1'] = {'score': i % 101, 'status': 'Observación', 'comment': COMMENT,
+                                          'documents': [f'evidencia_{i}.pdf', 'politica_general.pdf']}
+    return FrameworkCatalog('bench', tree, version='1'), db_controls
+
+
+def single_table_report(path, audit_type, catalog, db_controls):
+    doc = reports.SimpleDocTemplate(path, pagesize=reports.landscape(reports.letter))
+    data = [reports.REPORT_HEADER]
+    for entry in catalog:
+        control_data = db_controls.get(entry.id, {})
+        data.append([entry.id, reports.wrap_cell(entry.title, 1), str(control_data.get('score', 0)),
+                     reports.wrap_cell(control_data.get('status', ''), 3),
+                     reports.wrap_cell(control_data.get('comment', ''), 4),
+                     reports.wrap_cell(', '.join(control_data.get('documents', [])), 5)])
+    table = reports.Table(data, colWidths=reports.REPORT_COL_WIDTHS)
+    table.setStyle(reports.REPORT_TABLE_STYLE)
+    doc.build([table])
+
+
+def render(builder, rows, chapter_size, results):
+    catalog, db_controls = synthetic_audit(rows, chapter_size)
+    path = os.path.join(tempfile.mkdtemp(), 'report.pdf')
+    start = time.perf_counter()
+    builder(path, 'bench', catalog, db_controls)
+    elapsed = time.perf_counter() - start
+    results.put({
+        'seconds': round(elapsed, 3),
+        'rows_per_second': round(rows / elapsed, 1),
+        'peak_rss_mb': round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        'pdf_kb': round(os.path.getsize(path) / 1024, 1),
+    })
+
+
+def measure(builder, rows, chapter_size):
+    results = multiprocessing.Queue()
+    proc = multiprocessing.Process(target=render, args=(builder, rows, chapter_size, results))
+    proc.start()
+    result = results.get()
+    proc.join()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, nargs='+', default=[500, 2000, 10000])
+    parser.add_argument('--chapter-size', type=int, default=250)
+    parser.add_argument('--single-table', action='store_true')
+    parser.add_argument('--single-table-max', type=int, default=5000)
+    args = parser.parse_args()
+
+    results = {}
+    for rows in args.rows:
+        results[rows] = {'chunked': measure(reports.build_report, rows, args.chapter_size)}
+        if args.single_table and rows <= args.single_table_max:
+            results[rows]['single_table'] = measure(single_table_report, rows, args.chapter_size)
+    print(json.dumps(results, indent=4))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+"""Search latency over the evidence full-text index.
+
+Fills a fresh search.sqlite3 with --documents synthetic documents of --pages
+pages each (the text goes straight to SearchIndex.put_pages, so no PDF parsing
+is timed), then runs a mix of single and multi-word queries and reports the
+indexing rate and query latency percentiles.
+
+    python benchmarks/bench_search.py --documents 5000 --pages 10
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from search import SearchIndex  # noqa: E402
+
+DOMAIN_WORDS = ('política seguridad información acceso control respaldo contraseña riesgo activo proveedor '
+                'incidente continuidad negocio auditoría registro cifrado red usuario privilegio gestión '
+                'revisión dirección procedimiento evidencia datos personales tratamiento consentimiento '
+                'titular responsable encargado transferencia vulneración notificación plazo').split()
+# Natural text is Zipf-like: a few very common words and a long tail.
+VOCABULARY = DOMAIN_WORDS + [f'termino{i}' for i in range(20000)]
+WEIGHTS = [1 / rank for rank in range(1, len(VOCABULARY) + 1)]
+QUERIES = ['política', 'respaldo cifrado', 'datos personales consentimiento', 'notificación plazo incidente',
+           'proveedor', 'contraseña privilegio usuario', 'termino1500']
+
+
+def page_text(rng, words=300):
+    return ' '.join(rng.choices(VOCABULARY, WEIGHTS, k=words))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--documents', type=int, default=2000)
+    parser.add_argument('--pages', type=int, default=10)
+    parser.add_argument('--repeat', type=int, default=50)
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    index = SearchIndex(os.path.join(tempfile.mkdtemp(), 'search.sqlite3'))
+    indexing = 0
+    for i in range(args.documents):
+        pages = [(page, page_text(rng)) for page in range(1, args.pages + 1)]
+        start = time.perf_counter()
+        index.put_pages(f'doc_{i}.pdf', f'{i:064x}', pages)
+        indexing += time.perf_counter() - start
+
+    latencies = {}
+    for query in QUERIES:
+        samples = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            index.search(query, limit=20)
+            samples.append((time.perf_counter() - start) * 1e3)
+        samples.sort()
+        latencies[query] = {
+            'p50_ms': round(statistics.median(samples), 2),
+            'p95_ms': round(samples[int(len(samples) * 0.95) - 1], 2)
+        }
+    print(json.dumps({
+        'documents': args.documents,
+        'pages': args.documents * args.pages,
+        'index_pages_per_second': round(args.documents * args.pages / indexing, 1),
+        'queries': latencies
+    }, indent=4))
+
+
+if __name__ == '__main__':
+    main()
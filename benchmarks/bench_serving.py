@@ -0,0 +1,125 @@
+"""Throughput of the production server (gunicorn.conf.py) as workers are
+added: requests per second and latency percentiles for a few pages, with
+logged-in keep-alive clients, for each worker count.  On a machine with N cores
+throughput should grow about linearly up to N workers.
+
+    python benchmarks/bench_serving.py --workers 1 2 4 --threads 4 --seconds 10
+"""
+import argparse
+import http.client
+import json
+import multiprocessing
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.parse
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+PATHS = ['/', '/audit', '/api/summary/iso', '/api/v1/frameworks']
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def wait_ready(port, timeout=60):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            with socket.create_connection(('127.0.0.1', port), timeout=1):
+                pass
+            connection = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+            connection.request('GET', '/login')
+            if connection.getresponse().status == 200:
+                return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError('server did not start')
+
+
+def client(args):
+    # One keep-alive connection logged in as the auditor, requesting the paths
+    # in turn until the deadline; returns each request's latency, the non-200
+    # answers and the reconnections (a recycled worker closes its connections).
+    port, deadline = args
+    connection = http.client.HTTPConnection('127.0.0.1', port, timeout=60)
+    body = urllib.parse.urlencode({'username': 'auditor', 'password': 'auditor'})
+    connection.request('POST', '/login', body, {'Content-Type': 'application/x-www-form-urlencoded'})
+    response = connection.getresponse()
+    response.read()
+    cookie = response.getheader('Set-Cookie').split(';')[0]
+    latencies = []
+    errors = reconnects = 0
+    i = 0
+    while time.time() < deadline:
+        start = time.perf_counter()
+        try:
+            connection.request('GET', PATHS[i % len(PATHS)], headers={'Cookie': cookie})
+            response = connection.getresponse()
+            response.read()
+        except (http.client.RemoteDisconnected, ConnectionError):
+            connection.close()
+            reconnects += 1
+            continue
+        if response.status != 200:
+            errors += 1
+        latencies.append(time.perf_counter() - start)
+        i += 1
+    connection.close()
+    return latencies, errors, reconnects
+
+
+def run(workers, threads, clients, seconds):
+    port = free_port()
+    env = dict(os.environ, WEB_CONCURRENCY=str(workers), WEB_THREADS=str(threads), BIND=f'127.0.0.1:{port}',
+               PYTHONPATH=ROOT)
+    server = subprocess.Popen([sys.executable, '-m', 'gunicorn', '-c', os.path.join(ROOT, 'gunicorn.conf.py'),
+                               '--log-level', 'warning', 'app:app'],
+                              cwd=tempfile.mkdtemp(), env=env)
+    try:
+        wait_ready(port)
+        # Warm-up: every worker opens the default tenant
+        with multiprocessing.Pool(clients) as pool:
+            pool.map(client, [(port, time.time() + 1)] * clients)
+            start = time.time()
+            results = pool.map(client, [(port, start + seconds)] * clients)
+            elapsed = time.time() - start
+    finally:
+        server.terminate()
+        server.wait()
+    latencies = sorted(latency for result, errors, reconnects in results for latency in result)
+    return {
+        'workers': workers,
+        'threads': threads,
+        'clients': clients,
+        'requests': len(latencies),
+        'errors': sum(errors for result, errors, reconnects in results),
+        'reconnects': sum(reconnects for result, errors, reconnects in results),
+        'rps': round(len(latencies) / elapsed, 1),
+        'p50_ms': round(latencies[len(latencies) // 2] * 1e3, 2),
+        'p99_ms': round(latencies[int(len(latencies) * 0.99)] * 1e3, 2)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4])
+    parser.add_argument('--threads', type=int, default=4)
+    parser.add_argument('--clients', type=int, help='concurrent clients (default: 2 per worker thread of the largest run)')
+    parser.add_argument('--seconds', type=float, default=10)
+    args = parser.parse_args()
+    clients = args.clients or 2 * max(args.workers) * args.threads
+    results = [run(workers, args.threads, clients, args.seconds) for workers in args.workers]
+    base = results[0]['rps'] / results[0]['workers']
+    for result in results:
+        result['scaling'] = round(result['rps'] / (base * result['workers']), 2)
+    print(json.dumps({'cores': os.cpu_count(), 'runs': results}, indent=4))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+"""Cost of the control -> document suggestion engine.
+
+Builds the control TF-IDF matrices, indexes --documents synthetic documents
+(built from the frameworks' own control text plus noise, so they do match
+controls) through the search index listener path, then times scoring one new
+upload against every framework, a full rebuild, and the mapping-page read.
+
+    python benchmarks/bench_suggest.py --documents 2000
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+
+from catalog import FrameworkRegistry  # noqa: E402
+from search import SearchIndex  # noqa: E402
+from suggest import ControlVectors, SuggestionEngine, control_text  # noqa: E402
+
+
+def ms(seconds):
+    return round(seconds * 1e3, 2)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--documents', type=int, default=2000)
+    parser.add_argument('--pages', type=int, default=5)
+    args = parser.parse_args()
+
+    frameworks = FrameworkRegistry(os.path.join(ROOT, 'frameworks'), cache_dir=tempfile.mkdtemp())
+    texts = [control_text(frameworks[name], entry) for name in frameworks.names() for entry in frameworks[name]]
+    words = ' '.join(texts).split()
+    rng = random.Random(1)
+
+    def document_pages():
+        return [(page, ' '.join(rng.choice(texts).split() + rng.sample(words, 200)))
+                for page in range(1, args.pages + 1)]
+
+    results = {}
+    start = time.perf_counter()
+    for name in frameworks.names():
+        ControlVectors(frameworks[name])
+    results['control_vectors_ms'] = ms(time.perf_counter() - start)
+
+    index = SearchIndex(os.path.join(tempfile.mkdtemp(), 'search.sqlite3'))
+    engine = SuggestionEngine(index, frameworks)
+    for name in frameworks.names():
+        engine.rebuild(name)  # empty build, so uploads below take the incremental path
+    start = time.perf_counter()
+    for i in range(args.documents):
+        index.put_pages(f'doc_{i}.pdf', None, document_pages())
+    results['index_and_score_per_upload_ms'] = ms((time.perf_counter() - start) / args.documents)
+
+    pages = document_pages()
+    start = time.perf_counter()
+    engine.add_document('new.pdf', pages)
+    results['score_one_upload_ms'] = ms(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for name in frameworks.names():
+        engine.rebuild(name)
+    results['full_rebuild_ms'] = ms(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for _ in range(20):
+        engine.for_framework('ecuador')
+    results['mapping_page_read_ms'] = ms((time.perf_counter() - start) / 20)
+    results['documents'] = args.documents
+    print(json.dumps(results, indent=4))
+
+
+if __name__ == '__main__':
+    main()
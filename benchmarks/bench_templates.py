@@ -0,0 +1,70 @@
+"""Template costs a worker pays: compiling every template at startup with and
+without the bytecode cache, and rendering a mapping page chapter from scratch
+vs splicing suggestions into its pre-rendered fragment.
+
+    python benchmarks/bench_templates.py
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+
+from catalog import FrameworkRegistry  # noqa: E402
+from fragments import FragmentCache  # noqa: E402
+
+TEMPLATES = os.path.join(ROOT, 'templates')
+RUNS = 200
+
+
+def ms(seconds):
+    return round(seconds * 1e3, 3)
+
+
+def compile_all(bytecode_cache=None):
+    env = Environment(loader=FileSystemLoader(TEMPLATES), bytecode_cache=bytecode_cache)
+    start = time.perf_counter()
+    for name in env.list_templates(extensions=['html']):
+        env.get_template(name)
+    return time.perf_counter() - start
+
+
+def main():
+    cache = FileSystemBytecodeCache(tempfile.mkdtemp())
+    compile_all(cache)
+    results = {'compile_all_ms': ms(compile_all()), 'compile_all_bytecode_cache_ms': ms(compile_all(cache))}
+
+    env = Environment(loader=FileSystemLoader(TEMPLATES))
+    env.globals['suggested'] = env.get_template('suggestions.html').module.suggested
+    frameworks = FrameworkRegistry(os.path.join(ROOT, 'frameworks'), cache_dir=tempfile.mkdtemp())
+    for name in ('iso', 'ecuador'):
+        catalog = frameworks[name]
+        template = catalog.settings['map_template']
+        chapter = max(catalog.chapters, key=lambda chapter: len(catalog.chapter_ids[chapter]))
+        suggestions = {control_id: [('politica.pdf', 0.42), ('manual.pdf', 0.17)]
+                       for control_id in catalog.chapter_ids[chapter][::3]}
+
+        def fill(key):
+            return env.globals['suggested'](suggestions[key]) if key in suggestions else ''
+        start = time.perf_counter()
+        for _ in range(RUNS):
+            FragmentCache(env).render(template, 'chapter', catalog, chapter, fill)
+        full = time.perf_counter() - start
+        fragments = FragmentCache(env)
+        fragments.prerender(frameworks)
+        start = time.perf_counter()
+        for _ in range(RUNS):
+            fragments.render(template, 'chapter', catalog, chapter, fill)
+        cached = time.perf_counter() - start
+        results[name] = {'chapter': chapter, 'controls': len(catalog.chapter_ids[chapter]),
+                         'render_chapter_ms': ms(full / RUNS), 'cached_chapter_ms': ms(cached / RUNS)}
+    print(json.dumps(results, indent=4))
+
+
+if __name__ == '__main__':
+    main()
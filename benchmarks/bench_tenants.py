@@ -0,0 +1,88 @@
+"""Per-request cost as the number of tenants grows: a request to one tenant,
+requests spread over a working set that fits in the open-tenant cache, the
+first request to a tenant (opening its files) and resident memory.
+
+    python benchmarks/bench_tenants.py --tenants 1 10 100 1000
+"""
+import argparse
+import json
+import os
+import resource
+import sys
+import tempfile
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+os.chdir(tempfile.mkdtemp())  # importing app creates the default tenant in the cwd
+
+import app as audit_app  # noqa: E402
+from storage import open_store  # noqa: E402
+
+RUNS = 200
+WORKING_SET = 32
+MAPPED_CONTROLS = 40
+
+
+def ms(seconds):
+    return round(seconds * 1e3, 3)
+
+
+def create_tenant(name, control_ids):
+    audit_app.tenants.create(name, ['auditor'])
+    store = open_store('json', os.path.join(audit_app.tenants.root(name), audit_app.DB_FILE))
+    store.update(lambda db: db.setdefault('controls', {}).update({
+        control_id: {'documents': [f'{name}.pdf'], 'status': 'Mapeado'} for control_id in control_ids}))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--tenants', type=int, nargs='+', default=[1, 10, 100, 1000])
+    args = parser.parse_args()
+
+    control_ids = audit_app.frameworks['iso'].ids[:MAPPED_CONTROLS]
+    client = audit_app.app.test_client()
+
+    def request(tenant):
+        with client.session_transaction() as session:
+            session.update(username='auditor', role='auditor', tenant=tenant)
+        response = client.get('/audit')
+        assert response.status_code == 200
+        return response
+
+    results = {}
+    names = []
+    for count in sorted(args.tenants):
+        while len(names) < count:
+            names.append(f'org{len(names):04d}')
+            create_tenant(names[-1], control_ids)
+        request(names[0])
+        start = time.perf_counter()
+        for _ in range(RUNS):
+            request(names[0])
+        one = time.perf_counter() - start
+
+        working_set = names[:WORKING_SET]
+        for name in working_set:
+            request(name)
+        start = time.perf_counter()
+        for i in range(RUNS):
+            request(working_set[i % len(working_set)])
+        spread = time.perf_counter() - start
+
+        cold = names[WORKING_SET:][-20:]  # never requested yet
+        start = time.perf_counter()
+        for name in cold:
+            request(name)
+        results[count] = {
+            'one_tenant_ms': ms(one / RUNS),
+            'working_set_ms': ms(spread / RUNS),
+            'first_request_ms': ms((time.perf_counter() - start) / len(cold)) if cold else None,
+            'max_rss_mb': round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+            'tenants': audit_app.tenants.stats()
+        }
+    print(json.dumps(results, indent=4))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+"""Stress test for concurrent writers on the JSON log store.
+
+Starts N processes that each commit M transactions against the same database
+file: a disjoint control key per write, an append to 'documents' and an
+increment of one shared counter (which forces conflicts and retries).  Any
+lost update shows up as a count mismatch at the end.
+
+    python benchmarks/bench_transactions.py --writers 8 --ops 200
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from storage import LogStore  # noqa: E402
+
+
+def writer(path, writer_id, ops, compact_bytes):
+    store = LogStore(path, compact_bytes=compact_bytes)
+    for i in range(ops):
+        def apply(db):
+            db['controls'][f'W{writer_id}.{i}'] = {'score': i, 'status': 'Cumple', 'comment': '', 'documents': []}
+            db['documents'].append(f'w{writer_id}_{i}.pdf')
+        store.update(apply)
+
+        def increment(db):
+            db['audits']['counter'] = db['audits'].get('counter', 0) + 1
+        store.update(increment, retries=1000)
+    return store.stats()['conflicts']
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--writers', type=int, default=8)
+    parser.add_argument('--ops', type=int, default=100)
+    parser.add_argument('--compact-bytes', type=int, default=64 * 1024)
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.mkdtemp(), 'database.json')
+    start = time.perf_counter()
+    with multiprocessing.Pool(args.writers) as pool:
+        conflicts = pool.starmap(writer, [(path, w, args.ops, args.compact_bytes) for w in range(args.writers)])
+    elapsed = time.perf_counter() - start
+
+    db = LogStore(path).load()
+    expected = args.writers * args.ops
+    result = {
+        'writers': args.writers,
+        'ops_per_writer': args.ops,
+        'seconds': round(elapsed, 3),
+        'commits_per_second': round(2 * expected / elapsed, 1),
+        'conflicts_retried': sum(conflicts),
+        'lost_controls': expected - len(db['controls']),
+        'lost_documents': expected - len(db['documents']),
+        'lost_increments': expected - db['audits'].get('counter', 0),
+    }
+    print(json.dumps(result, indent=4))
+    return 0 if not (result['lost_controls'] or result['lost_documents'] or result['lost_increments']) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
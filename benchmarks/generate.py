@@ -0,0 +1,128 @@
+"""Synthetic audit database generator for the benchmark suite.
+
+Fills a directory laid out like a tenant (the default tenant when the app is
+started in it): --documents dummy PDFs of --pages pages of domain text, stored
+through the evidence store, listed in the document catalog and indexed for
+search; a share of the ISO 27001 and LOPDP controls mapped to documents and,
+of those, a share evaluated with a score, its status and a comment of
+--comment-words words.  Everything goes through the same services the app
+uses, so the result is what a real installation of that size looks like.
+
+    python benchmarks/generate.py /tmp/audit-large --documents 5000 --iso 0.8 --lopdp 0.6
+    cd /tmp/audit-large && python /path/to/app.py
+"""
+import argparse
+import io
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+
+from reportlab.lib.pagesizes import letter  # noqa: E402
+from reportlab.pdfgen import canvas  # noqa: E402
+
+import app as audit_app  # noqa: E402
+from bench_search import DOMAIN_WORDS  # noqa: E402
+from storage import collection_for  # noqa: E402
+
+COMMENT_WORDS = ('se revisaron las evidencias entregadas el control se encuentra implementado parcialmente '
+                 'y se recomienda completar la documentación del procedimiento con responsables plazos '
+                 'y registros de revisión por la dirección').split()
+LINES_PER_PAGE = 40
+UPLOAD_SPREAD_DAYS = 180
+
+
+def dummy_pdf(rng, title, pages):
+    buffer = io.BytesIO()
+    pdf = canvas.Canvas(buffer, pagesize=letter)
+    for page in range(pages):
+        text = pdf.beginText(72, 720)
+        text.textLine(f'{title} - página {page + 1}')
+        for _ in range(LINES_PER_PAGE):
+            text.textLine(' '.join(rng.choices(DOMAIN_WORDS, k=12)))
+        pdf.drawText(text)
+        pdf.showPage()
+    pdf.save()
+    buffer.seek(0)
+    return buffer
+
+
+def comment(rng, words):
+    return ' '.join(rng.choice(COMMENT_WORDS) for _ in range(words)).capitalize() + '.'
+
+
+def generate(root, documents=200, pages=2, iso=0.6, lopdp=0.4, evaluated=0.7, comment_words=30,
+             documents_per_control=2, backend='json', index=True, seed=1):
+    # Returns a summary of what was written
+    rng = random.Random(seed)
+    os.makedirs(root, exist_ok=True)
+    audit_app.app.config['STORAGE_BACKEND'] = backend
+    tenant = audit_app.open_tenant('bench', root)
+
+    names = []
+    files = {}
+    now = time.time()
+    for i in range(documents):
+        name = f'evidencia_{i:05d}.pdf'
+        info = tenant.evidence.receive(dummy_pdf(rng, name, pages))
+        info['uploaded'] = now - rng.uniform(0, UPLOAD_SPREAD_DAYS * 86400)
+        files[name] = info
+        names.append(name)
+    tenant.store.add_document_files(files)
+    tenant.document_catalog.add(files, 'user')
+    for info in files.values():
+        tenant.evidence.unpin(info['sha256'])
+    if index:
+        for name, info in files.items():
+            tenant.search_index.index(name, tenant.evidence.object_path(info['sha256']), info['sha256'])
+
+    mapped = {}
+    for framework, share in (('iso', iso), ('ecuador', lopdp)):
+        catalog = audit_app.frameworks[framework]
+        records = {}
+        for control_id in catalog.ids:
+            if not names or rng.random() >= share:
+                continue
+            record = {'title': catalog.control_title(control_id),
+                      'documents': rng.sample(names, min(documents_per_control, len(names)))}
+            if rng.random() < evaluated:
+                score = rng.choice([0, 100, rng.randint(1, 99)])
+                record.update(score=score, status=audit_app.evaluation_status(catalog, score),
+                              comment=comment(rng, comment_words))
+            records[control_id] = record
+        tenant.store.update(lambda db: db.setdefault(collection_for(framework), {}).update(records))
+        mapped[framework] = len(records)
+    return {'root': os.path.abspath(root), 'backend': backend, 'documents': documents, 'pages': pages,
+            'mapped': mapped, 'comment_words': comment_words, 'db_bytes': tenant.store.disk_bytes(),
+            'indexed': tenant.search_index.stats() if index else None}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('root', nargs='?', help='directory to fill (default: a new temporary one)')
+    parser.add_argument('--documents', type=int, default=200)
+    parser.add_argument('--pages', type=int, default=2, help='pages per dummy PDF')
+    parser.add_argument('--iso', type=float, default=0.6, help='share of ISO controls mapped')
+    parser.add_argument('--lopdp', type=float, default=0.4, help='share of LOPDP controls mapped')
+    parser.add_argument('--evaluated', type=float, default=0.7, help='share of mapped controls evaluated')
+    parser.add_argument('--comment-words', type=int, default=30)
+    parser.add_argument('--documents-per-control', type=int, default=2)
+    parser.add_argument('--backend', choices=['json', 'sqlite'], default='json')
+    parser.add_argument('--no-index', action='store_true', help='skip the full-text index')
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+    start = time.perf_counter()
+    summary = generate(args.root or tempfile.mkdtemp(prefix='audit-bench-'), args.documents, args.pages,
+                       args.iso, args.lopdp, args.evaluated, args.comment_words, args.documents_per_control,
+                       args.backend, not args.no_index, args.seed)
+    summary['seconds'] = round(time.perf_counter() - start, 2)
+    print(json.dumps(summary, indent=4))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,303 @@
+"""Benchmark suite: generates a synthetic database (see generate.py), times
+the storage, report and heatmap functions on it, then load-tests a local app
+instance (gunicorn.conf.py) serving it, and writes everything to one JSON file.
+With --compare, the run is checked against an earlier result file and every
+metric more than --threshold worse is reported (exit status 1), so two
+commits can be compared on the same machine.
+
+    python benchmarks/suite.py --preset medium --output before.json
+    python benchmarks/suite.py --preset medium --output after.json --compare before.json
+
+--url runs the load test against an instance that is already running instead
+(and its data); --skip-http and --skip-micro run half of the suite.
+"""
+import argparse
+import http.client
+import json
+import multiprocessing
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.parse
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+sys.path.insert(0, ROOT)
+
+from bench_serving import free_port, wait_ready  # noqa: E402
+
+PRESETS = {
+    'small': {'documents': 50, 'iso': 0.5, 'lopdp': 0.3, 'comment_words': 20},
+    'medium': {'documents': 500, 'iso': 0.7, 'lopdp': 0.5, 'comment_words': 40},
+    'large': {'documents': 3000, 'iso': 0.9, 'lopdp': 0.8, 'comment_words': 80}
+}
+# Pages each role's clients request in turn
+HTTP_PATHS = {
+    'auditor': ['/', '/audit', '/audit_ecuador', '/heatmap/iso', '/api/summary/iso', '/search?q=pol%C3%ADtica',
+                '/api/v1/controls?framework=iso&limit=100', '/generate_report/iso'],
+    'user': ['/upload', '/map_controls', '/map_controls_ecuador', '/documents?sort=size']
+}
+# Metrics where larger is better; all others are times
+HIGHER_IS_BETTER = ('rps',)
+
+
+def summarize(seconds):
+    seconds = sorted(seconds)
+    return {
+        'runs': len(seconds),
+        'min_ms': round(seconds[0] * 1e3, 3),
+        'median_ms': round(statistics.median(seconds) * 1e3, 3),
+        'p95_ms': round(seconds[min(int(len(seconds) * 0.95), len(seconds) - 1)] * 1e3, 3),
+        'mean_ms': round(statistics.fmean(seconds) * 1e3, 3)
+    }
+
+
+def timeit(fn, runs, setup=None):
+    # [seconds per call]; setup() runs before each call, untimed
+    times = []
+    for _ in range(runs):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def micro(root, backend, runs, report_runs):
+    import app as audit_app
+    import heatmap
+    import reports
+    from storage import open_store
+
+    audit_app.app.config['STORAGE_BACKEND'] = backend
+    tenant = audit_app.open_tenant('bench', root)
+    store = tenant.store
+    path = store.path
+    catalogs = {name: audit_app.frameworks[name] for name in ('iso', 'ecuador')}
+    control_ids = list(store.controls('iso')) or catalogs['iso'].ids
+    results = {}
+
+    # Storage: opening (snapshot + log, or the schema check), load()'s deep
+    # copy, the read-only view, save() with one changed control and a
+    # record-level update.
+    results['storage_open'] = summarize(timeit(lambda: open_store(backend, path), runs))
+    results['storage_load'] = summarize(timeit(store.load, runs))
+    results['storage_view'] = summarize(timeit(store.view, runs))
+    db = store.load()
+    counter = iter(range(10 ** 9))
+
+    def change():
+        db.setdefault('controls', {}).setdefault(control_ids[0], {})['comment'] = f'Revisión {next(counter)}'
+    results['storage_save'] = summarize(timeit(lambda: store.save(db), runs, setup=change))
+    results['storage_update_control'] = summarize(timeit(
+        lambda: store.update_control('iso', control_ids[next(counter) % len(control_ids)],
+                                     {'score': next(counter) % 101}), runs))
+
+    # Reports: the PDF of each framework (reportlab doc.build)
+    folder = tempfile.mkdtemp()
+    for name, catalog in catalogs.items():
+        db_controls = store.controls(name)
+        results[f'report_build_{name}'] = summarize(timeit(
+            lambda: reports.build_report(os.path.join(folder, f'{name}.pdf'), name, catalog, db_controls),
+            report_runs))
+
+    # Heatmaps: matrix, figure and JSON from scratch, and a cached hit
+    for name, catalog in catalogs.items():
+        db_controls = store.controls(name)
+        results[f'heatmap_build_{name}'] = summarize(timeit(
+            lambda: heatmap.HeatmapCache().get(name, catalog, db_controls), runs))
+        cache = heatmap.HeatmapCache()
+        cache.get(name, catalog, db_controls)
+        results[f'heatmap_cached_{name}'] = summarize(timeit(lambda: cache.get(name, catalog, db_controls), runs))
+    return results
+
+
+def client(args):
+    # One keep-alive connection logged in with the role, requesting its paths
+    # in turn until the deadline; {path: [seconds]} and {path: errors}
+    base, role, deadline = args
+    url = urllib.parse.urlsplit(base)
+    connection = http.client.HTTPConnection(url.hostname, url.port, timeout=120)
+    body = urllib.parse.urlencode({'username': role, 'password': role})
+    connection.request('POST', '/login', body, {'Content-Type': 'application/x-www-form-urlencoded'})
+    response = connection.getresponse()
+    response.read()
+    cookie = response.getheader('Set-Cookie').split(';')[0]
+    paths = HTTP_PATHS[role]
+    latencies = {path: [] for path in paths}
+    errors = {path: 0 for path in paths}
+    i = 0
+    while time.time() < deadline:
+        path = paths[i % len(paths)]
+        start = time.perf_counter()
+        try:
+            connection.request('GET', path, headers={'Cookie': cookie})
+            response = connection.getresponse()
+            response.read()
+        except (http.client.RemoteDisconnected, ConnectionError):
+            # A recycled worker closed the connection
+            connection.close()
+            continue
+        latencies[path].append(time.perf_counter() - start)
+        if response.status >= 400:
+            errors[path] += 1
+        i += 1
+    connection.close()
+    return latencies, errors
+
+
+def load_test(base, clients, seconds):
+    roles = ['auditor' if i % 2 == 0 else 'user' for i in range(clients)]
+    with multiprocessing.Pool(clients) as pool:
+        # Warm-up: every worker opens the tenant and fills its caches
+        pool.map(client, [(base, role, time.time() + 2) for role in roles])
+        start = time.time()
+        results = pool.map(client, [(base, role, start + seconds) for role in roles])
+        elapsed = time.time() - start
+    paths = {}
+    total = 0
+    for latencies, errors in results:
+        for path, times in latencies.items():
+            entry = paths.setdefault(path, {'times': [], 'errors': 0})
+            entry['times'] += times
+            entry['errors'] += errors[path]
+            total += len(times)
+    return {
+        'clients': clients,
+        'seconds': round(elapsed, 2),
+        'requests': total,
+        'rps': round(total / elapsed, 1),
+        'paths': {path: dict(summarize(entry['times']), errors=entry['errors'],
+                             rps=round(len(entry['times']) / elapsed, 1))
+                  for path, entry in sorted(paths.items()) if entry['times']}
+    }
+
+
+def serve(root, backend, workers, threads):
+    port = free_port()
+    env = dict(os.environ, STORAGE_BACKEND=backend, WEB_CONCURRENCY=str(workers), WEB_THREADS=str(threads),
+               BIND=f'127.0.0.1:{port}', PYTHONPATH=ROOT)
+    server = subprocess.Popen([sys.executable, '-m', 'gunicorn', '-c', os.path.join(ROOT, 'gunicorn.conf.py'),
+                               '--log-level', 'warning', 'app:app'], cwd=root, env=env)
+    wait_ready(port)
+    return server, f'http://127.0.0.1:{port}'
+
+
+def flatten(results, prefix=''):
+    # {'micro.storage_load.median_ms': 1.2, ...}: medians and throughputs;
+    # tail latencies of short runs are too noisy to compare
+    flat = {}
+    for key, value in results.items():
+        name = f'{prefix}{key}'
+        if isinstance(value, dict):
+            flat.update(flatten(value, name + '.'))
+        elif key in ('median_ms', 'rps') and isinstance(value, (int, float)):
+            flat[name] = value
+    return flat
+
+
+def compare(current, baseline, threshold):
+    # [(metric, baseline, current, change)] of the metrics worse than the threshold
+    old = flatten(baseline.get('results', {}))
+    regressions = []
+    for name, value in sorted(flatten(current['results']).items()):
+        before = old.get(name)
+        if not before:
+            continue
+        change = (value - before) / before
+        if name.endswith(HIGHER_IS_BETTER):
+            change = -change
+        if change > threshold:
+            regressions.append((name, before, value, round(change * 100, 1)))
+    return regressions
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=ROOT, capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--preset', choices=sorted(PRESETS), default='small')
+    parser.add_argument('--documents', type=int)
+    parser.add_argument('--iso', type=float, help='share of ISO controls mapped')
+    parser.add_argument('--lopdp', type=float, help='share of LOPDP controls mapped')
+    parser.add_argument('--comment-words', type=int)
+    parser.add_argument('--backend', choices=['json', 'sqlite'], default='json')
+    parser.add_argument('--root', help='generate into (or reuse with --reuse) this directory')
+    parser.add_argument('--reuse', action='store_true', help='use the database already in --root')
+    parser.add_argument('--runs', type=int, default=20, help='runs of each microbenchmark')
+    parser.add_argument('--report-runs', type=int, default=3)
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--threads', type=int, default=4)
+    parser.add_argument('--clients', type=int, default=8)
+    parser.add_argument('--seconds', type=float, default=10)
+    parser.add_argument('--url', help='load-test this running instance instead of starting one')
+    parser.add_argument('--skip-micro', action='store_true')
+    parser.add_argument('--skip-http', action='store_true')
+    parser.add_argument('--output', help='result file (default: stdout only)')
+    parser.add_argument('--compare', help='earlier result file to check for regressions')
+    parser.add_argument('--threshold', type=float, default=0.10, help='tolerated slowdown (0.10 = 10%%)')
+    args = parser.parse_args()
+
+    params = dict(PRESETS[args.preset])
+    for key in ('documents', 'iso', 'lopdp', 'comment_words'):
+        if getattr(args, key) is not None:
+            params[key] = getattr(args, key)
+    root = args.root or tempfile.mkdtemp(prefix='audit-bench-')
+    result = {
+        'meta': {'time': time.strftime('%Y-%m-%dT%H:%M:%S'), 'commit': git_commit(),
+                 'python': platform.python_version(), 'platform': platform.platform(), 'cpus': os.cpu_count(),
+                 'preset': args.preset, 'params': params, 'backend': args.backend},
+        'results': {}
+    }
+
+    if not args.reuse:
+        from generate import generate
+        print(f'Generating {params["documents"]} documents in {root}', file=sys.stderr)
+        result['meta']['database'] = generate(root, params['documents'], iso=params['iso'], lopdp=params['lopdp'],
+                                              comment_words=params['comment_words'], backend=args.backend)
+    if not args.skip_micro:
+        print('Microbenchmarks', file=sys.stderr)
+        result['results']['micro'] = micro(root, args.backend, args.runs, args.report_runs)
+    if not args.skip_http:
+        server = None
+        base = args.url
+        if base is None:
+            server, base = serve(root, args.backend, args.workers, args.threads)
+            result['meta'].update(workers=args.workers, threads=args.threads)
+        print(f'Load test against {base}', file=sys.stderr)
+        try:
+            result['results']['http'] = load_test(base, args.clients, args.seconds)
+        finally:
+            if server is not None:
+                server.terminate()
+                server.wait()
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        result['regressions'] = [{'metric': name, 'baseline': before, 'current': value, 'change_pct': change}
+                                 for name, before, value, change in compare(result, baseline, args.threshold)]
+    text = json.dumps(result, indent=4)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text + '\n')
+    print(text)
+    if result.get('regressions'):
+        for regression in result['regressions']:
+            print('REGRESSION {metric}: {baseline} -> {current} ({change_pct:+}%)'.format(**regression),
+                  file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
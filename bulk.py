@@ -0,0 +1,109 @@
+import csv
+import io
+import json
+import os
+import re
+import zipfile
+
+from werkzeug.utils import secure_filename
+
+from evidence import UploadError, MAX_UPLOAD_BYTES
+
+# Batch onboarding: many evidence files (loose PDFs or zip archives) in one
+# request, and control -> documents mapping manifests (CSV or JSON).  The
+# helpers here only read the input and produce one result row per file or
+# manifest line; app.py writes each batch to the database in a single commit.
+
+MAX_BULK_FILES = 1000
+MAX_BULK_BYTES = MAX_UPLOAD_BYTES
+# Separators accepted inside the CSV documents column
+DOCUMENT_SEPARATOR = re.compile(r'[;|]')
+
+
+def received_row(source, document, info):
+    return {'file': source, 'document': document, 'status': 'received', 'info': info}
+
+
+def rejected_row(source, detail):
+    return {'file': source, 'document': None, 'status': 'rejected', 'detail': detail}
+
+
+def upload_rows(files, evidence):
+    # Stores every PDF in files (expanding zip archives) and yields one row per
+    # file; stops accepting files past MAX_BULK_FILES / MAX_BULK_BYTES.
+    count = 0
+    total = 0
+
+    def receive(source, name, stream):
+        nonlocal count, total
+        filename = secure_filename(os.path.basename(name))
+        if not filename.lower().endswith('.pdf'):
+            return rejected_row(source, 'solo se aceptan archivos PDF')
+        if count >= MAX_BULK_FILES:
+            return rejected_row(source, f'más de {MAX_BULK_FILES} archivos en la carga')
+        try:
+            info = evidence.receive(stream, max_bytes=MAX_BULK_BYTES - total)
+        except UploadError:
+            return rejected_row(source, 'la carga supera el tamaño máximo')
+        count += 1
+        total += info['size']
+        return received_row(source, filename, info)
+
+    for file in files:
+        if not file.filename:
+            continue
+        if not file.filename.lower().endswith('.zip'):
+            yield receive(file.filename, file.filename, file.stream)
+            continue
+        try:
+            archive = zipfile.ZipFile(file.stream)
+        except zipfile.BadZipFile:
+            yield rejected_row(file.filename, 'archivo zip inválido')
+            continue
+        with archive:
+            for member in archive.infolist():
+                if member.is_dir():
+                    continue
+                source = f'{file.filename}/{member.filename}'
+                try:
+                    with archive.open(member) as stream:
+                        yield receive(source, member.filename, stream)
+                except (zipfile.BadZipFile, NotImplementedError, RuntimeError) as e:
+                    # corrupt member, unsupported compression or encrypted
+                    yield rejected_row(source, str(e))
+
+
+def parse_manifest(filename, data):
+    # Mapping manifest -> [{'row': n, 'control': id, 'documents': [...]}].
+    #   JSON: [{"control": "A.5.1.1", "documents": ["a.pdf", ...]}, ...]
+    #         or {"A.5.1.1": ["a.pdf", ...], ...}
+    #   CSV:  header "control,documents"; several documents separated by ; or |
+    #         (a control may also repeat over several lines)
+    # Raises ValueError if the file cannot be read at all.
+    text = data.decode('utf-8-sig')
+    if filename.lower().endswith('.json') or text.lstrip()[:1] in ('[', '{'):
+        manifest = json.loads(text)
+        if isinstance(manifest, dict):
+            manifest = [{'control': control, 'documents': documents} for control, documents in manifest.items()]
+        if not isinstance(manifest, list):
+            raise ValueError('the JSON manifest must be a list or an object')
+        rows = []
+        for number, item in enumerate(manifest, 1):
+            item = item if isinstance(item, dict) else {}
+            documents = item.get('documents', [])
+            if isinstance(documents, str):
+                documents = [documents]
+            rows.append({'row': number, 'control': str(item.get('control') or '').strip(),
+                         'documents': [str(document).strip() for document in documents if str(document).strip()]})
+        return rows
+
+    reader = csv.DictReader(io.StringIO(text))
+    if not reader.fieldnames or 'control' not in [name.strip().lower() for name in reader.fieldnames]:
+        raise ValueError('the CSV manifest needs a "control" column')
+    rows = []
+    for number, line in enumerate(reader, 2):
+        line = {(key or '').strip().lower(): value or '' for key, value in line.items()}
+        rows.append({'row': number, 'control': line.get('control', '').strip(),
+                     'documents': [document.strip() for document in DOCUMENT_SEPARATOR.split(line.get('documents', ''))
+                                   if document.strip()]})
+    return rows
@@ -0,0 +1,180 @@
+import json
+import os
+import pickle
+import threading
+from collections import namedtuple
+
+try:
+    import yaml
+except ImportError:  # YAML framework files are optional
+    yaml = None
+
+# Flat, precomputed index over a nested framework definition
+# (chapter -> controls -> subcontrols, or chapter -> articles with content),
+# so routes get O(1) lookups instead of re-walking the tree.
+#
+# Framework definitions live as data files in frameworks/ (see
+# FrameworkRegistry); each one is parsed and indexed the first time it is used
+# and the built catalog is pickled to frameworks/.cache for the next start.
+
+CatalogEntry = namedtuple('CatalogEntry', ['id', 'chapter', 'control', 'title', 'content'])
+
+FRAMEWORK_EXTENSIONS = ('.json', '.yaml', '.yml') if yaml is not None else ('.json',)
+CACHE_FORMAT = 1
+DEFAULT_SETTINGS = {
+    'mapped_status': 'pending',
+    # 'bands': Cumple / Observación / No conformidad menor / mayor by score range,
+    # 'evaluated': any saved score marks the control as Evaluado
+    'scoring': 'bands',
+    # mapping again replaces the evaluation instead of only the documents
+    'reset_on_map': False,
+    'audit_mapped_only': True,
+    'map_template': 'map_controls_framework.html',
+    'audit_template': 'audit_framework.html'
+}
+
+
+class FrameworkCatalog:
+    def __init__(self, name, tree, title=None, version='', settings=None):
+        self.name = name
+        self.tree = tree
+        self.title = title or name.upper()
+        self.version = version
+        self.settings = dict(DEFAULT_SETTINGS, **(settings or {}))
+        self.entries = {}
+        self.ordered = []
+        self.ids = []
+        self.positions = {}
+        self.chapters = []
+        self.chapter_titles = {}
+        self.control_titles = {}
+        self.chapter_ids = {}
+        self.chapter_ranges = {}
+
+        for chapter, chapter_data in tree.items():
+            start = len(self.ids)
+            self.chapters.append(chapter)
+            self.chapter_titles[chapter] = chapter_data['title']
+            for control_id, control in chapter_data['controls'].items():
+                self.control_titles[control_id] = control['title']
+                if 'subcontrols' in control:
+                    # ISO style: the evaluated unit is the subcontrol
+                    for subcontrol_id, subcontrol_title in control['subcontrols'].items():
+                        self._add(CatalogEntry(subcontrol_id, chapter, control_id, subcontrol_title, ''))
+                else:
+                    # Law style: the evaluated unit is the article, keyed CAP.X_Art.Y
+                    self._add(CatalogEntry(f"{chapter}_{control_id}", chapter, control_id,
+                                           control['title'], control.get('content', '')))
+            self.chapter_ids[chapter] = self.ids[start:]
+            self.chapter_ranges[chapter] = (start, len(self.ids))
+
+    def _add(self, entry):
+        self.positions[entry.id] = len(self.ids)
+        self.entries[entry.id] = entry
+        self.ordered.append(entry)
+        self.ids.append(entry.id)
+
+    def __iter__(self):
+        return iter(self.ordered)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __contains__(self, control_id):
+        return control_id in self.entries
+
+    def get(self, control_id):
+        return self.entries.get(control_id)
+
+    def control_title(self, control_id):
+        entry = self.entries.get(control_id)
+        return entry.title if entry else None
+
+    def sort_ids(self, control_ids):
+        # Catalog order; ids that are not part of the framework go last.
+        end = len(self.ids)
+        return sorted(control_ids, key=lambda control_id: self.positions.get(control_id, end))
+
+
+def read_framework_file(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        if path.endswith('.json'):
+            return json.load(f)
+        return yaml.safe_load(f)
+
+
+class FrameworkRegistry:
+    # Discovers framework files in a directory and loads each one on first use.
+    # Startup only lists the directory, so adding frameworks costs nothing until
+    # somebody opens one.
+    def __init__(self, directory, cache_dir=None):
+        self.directory = directory
+        self.cache_dir = cache_dir or os.path.join(directory, '.cache')
+        self._lock = threading.Lock()
+        self._sources = {}
+        self._catalogs = {}
+        self.discover()
+
+    def discover(self):
+        sources = {}
+        if os.path.isdir(self.directory):
+            for entry in sorted(os.scandir(self.directory), key=lambda e: e.name):
+                name, ext = os.path.splitext(entry.name)
+                if entry.is_file() and ext in FRAMEWORK_EXTENSIONS:
+                    sources.setdefault(name, entry.path)
+        self._sources = sources
+
+    def names(self):
+        return list(self._sources)
+
+    def __contains__(self, name):
+        return name in self._sources
+
+    def __getitem__(self, name):
+        catalog = self.get(name)
+        if catalog is None:
+            raise KeyError(name)
+        return catalog
+
+    def get(self, name):
+        catalog = self._catalogs.get(name)
+        if catalog is not None:
+            return catalog
+        if name not in self._sources:
+            # Pick up framework files added since startup.
+            self.discover()
+            if name not in self._sources:
+                return None
+        with self._lock:
+            if name not in self._catalogs:
+                self._catalogs[name] = self._load(name, self._sources[name])
+            return self._catalogs[name]
+
+    def loaded(self):
+        return list(self._catalogs)
+
+    def _load(self, name, path):
+        st = os.stat(path)
+        signature = (CACHE_FORMAT, st.st_mtime_ns, st.st_size)
+        cache_path = os.path.join(self.cache_dir, name + '.pickle')
+        try:
+            with open(cache_path, 'rb') as f:
+                cached_signature, catalog = pickle.load(f)
+            if cached_signature == signature:
+                return catalog
+        except (OSError, pickle.PickleError, EOFError, AttributeError, ValueError):
+            pass
+
+        data = read_framework_file(path)
+        catalog = FrameworkCatalog(name, data['chapters'],
+                                   title=data.get('title'), version=data.get('version', ''),
+                                   settings=data.get('settings'))
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                pickle.dump((signature, catalog), f, pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, cache_path)
+        except OSError:
+            pass  # read-only checkout: just build it again next time
+        return catalog
@@ -0,0 +1,240 @@
+import json
+import threading
+
+from search import connect
+
+# Document catalog.  One row per uploaded document in documents.sqlite3 with
+# its uploader, upload time, size, hash and page count, plus the controls it is
+# mapped to, so the home and upload pages list a sorted, filtered page of
+# documents with a single indexed query instead of the whole 'documents' list.
+# Rows are written on upload and delete; the mapped controls follow the store's
+# change feed (only writes that change a control's documents touch the
+# catalog).  Feed events arrive while the store holds its locks, so they are
+# only queued there and written to the catalog before its next read.  The
+# uploader is only known for uploads made since the catalog exists; older
+# documents are seeded from the store without one.
+
+SEED_BATCH = 1000
+DOCUMENT_SORTS = {
+    'uploaded': 'uploaded DESC, name',
+    'name': 'name',
+    'size': 'size DESC, name'
+}
+CATALOG_SCHEMA = """
+CREATE TABLE IF NOT EXISTS catalog (
+    name TEXT PRIMARY KEY,
+    sha256 TEXT,
+    size INTEGER,
+    pages INTEGER,
+    uploaded REAL,
+    uploader TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_catalog_uploaded ON catalog (uploaded);
+CREATE INDEX IF NOT EXISTS idx_catalog_size ON catalog (size);
+CREATE INDEX IF NOT EXISTS idx_catalog_uploader ON catalog (uploader, uploaded);
+CREATE TABLE IF NOT EXISTS links (
+    framework TEXT NOT NULL,
+    control_id TEXT NOT NULL,
+    name TEXT NOT NULL,
+    PRIMARY KEY (framework, control_id, name)
+);
+CREATE INDEX IF NOT EXISTS idx_links_name ON links (name);
+"""
+
+
+def like_pattern(text):
+    return '%' + text.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+
+
+class DocumentCatalog:
+    def __init__(self, path, store, frameworks):
+        self.path = path
+        self.store = store
+        self.frameworks = frameworks
+        self._local = threading.local()
+        # Feed events not yet written: ('link', framework, control_id, documents)
+        # or ('relink', framework)
+        self._pending = []
+        self._pending_lock = threading.Lock()
+        self._apply_lock = threading.Lock()
+        self._conn().executescript(CATALOG_SCHEMA)
+        self._seed()
+        store.listeners.append(self._control_changed)
+
+    def _conn(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._local.conn = connect(self.path)
+        return conn
+
+    def _seed(self):
+        # Documents the catalog has not seen (uploaded before it existed or
+        # imported into the store) and the current mappings.
+        # The store is read before the write transaction opens: a commit holding
+        # the store's lock must never wait for this one.
+        conn = self._conn()
+        names = set(self.store.documents())
+        if conn.execute('SELECT COUNT(*) FROM catalog').fetchone()[0] != len(names):
+            known = {row['name'] for row in conn.execute('SELECT name FROM catalog')}
+            new = {}
+            after = 0
+            while True:
+                rows = self.store.documents_page(after, SEED_BATCH)
+                for position, name, info in rows:
+                    if name not in known:
+                        new.setdefault(name, info or {})
+                if len(rows) < SEED_BATCH:
+                    break
+                after = rows[-1][0]
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                conn.executemany('DELETE FROM catalog WHERE name = ?', [(name,) for name in known - names])
+                for name, info in new.items():
+                    self._put(conn, name, info, None)
+                conn.execute('COMMIT')
+            except BaseException:
+                conn.execute('ROLLBACK')
+                raise
+        self._relink(None)
+
+    @staticmethod
+    def _put(conn, name, info, uploader):
+        conn.execute('INSERT OR REPLACE INTO catalog (name, sha256, size, pages, uploaded, uploader) '
+                     'VALUES (?, ?, ?, ?, ?, ?)',
+                     (name, info.get('sha256'), info.get('size'), info.get('pages'), info.get('uploaded'), uploader))
+
+    def add(self, files, uploader=None):
+        # files: {name: file info} as recorded in the store
+        conn = self._conn()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            for name, info in files.items():
+                self._put(conn, name, info, uploader)
+            conn.execute('COMMIT')
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+
+    def remove(self, name):
+        conn = self._conn()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            conn.execute('DELETE FROM catalog WHERE name = ?', (name,))
+            conn.execute('DELETE FROM links WHERE name = ?', (name,))
+            conn.execute('COMMIT')
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+
+    def _control_changed(self, framework, control_id, old, new):
+        # Called under the store's locks: queue only.
+        if control_id is None:
+            event = ('relink', framework)
+        else:
+            documents = list((new or {}).get('documents') or ())
+            if list((old or {}).get('documents') or ()) == documents:
+                return
+            event = ('link', framework, control_id, documents)
+        with self._pending_lock:
+            if event == ('relink', None):
+                # Everything is read again: earlier events no longer matter
+                self._pending = [event]
+            else:
+                self._pending.append(event)
+
+    def _apply_pending(self):
+        # Writes the queued feed events, in order; other workers' commits are
+        # picked up first, as their events are only delivered on a store read.
+        self.store.sync()
+        with self._apply_lock:
+            with self._pending_lock:
+                events, self._pending = self._pending, []
+            while events:
+                if events[0][0] == 'relink':
+                    self._relink(events.pop(0)[1])
+                    continue
+                links = []
+                while events and events[0][0] == 'link':
+                    links.append(events.pop(0)[1:])
+                self._link(links)
+
+    def _link(self, links):
+        # links: [(framework, control_id, documents)]
+        conn = self._conn()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            for framework, control_id, documents in links:
+                conn.execute('DELETE FROM links WHERE framework = ? AND control_id = ?', (framework, control_id))
+                conn.executemany('INSERT OR IGNORE INTO links (framework, control_id, name) VALUES (?, ?, ?)',
+                                 [(framework, control_id, name) for name in documents])
+            conn.execute('COMMIT')
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+
+    def _relink(self, framework):
+        # Mappings of one framework (all of them for None) read again from the store
+        names = [framework] if framework is not None else self.frameworks.names()
+        rows = [(name, control_id, document) for name in names
+                for control_id, record in self.store.controls(name, mapped_only=True).items()
+                for document in record.get('documents') or ()]
+        conn = self._conn()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            if framework is None:
+                conn.execute('DELETE FROM links')
+            else:
+                conn.execute('DELETE FROM links WHERE framework = ?', (framework,))
+            conn.executemany('INSERT OR IGNORE INTO links (framework, control_id, name) VALUES (?, ?, ?)', rows)
+            conn.execute('COMMIT')
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+
+    def page(self, filters, sort='uploaded', offset=0, limit=25):
+        # (rows, total) for one page; filters: {'q': name contains,
+        # 'uploader', 'linked': 'yes'/'no'}, empty values are ignored
+        self._apply_pending()
+        where, params = [], []
+        if filters.get('q'):
+            where.append("name LIKE ? ESCAPE '\\'")
+            params.append(like_pattern(filters['q']))
+        if filters.get('uploader'):
+            where.append('uploader = ?')
+            params.append(filters['uploader'])
+        if filters.get('linked') in ('yes', 'no'):
+            where.append('name ' + ('' if filters['linked'] == 'yes' else 'NOT ') + 'IN (SELECT name FROM links)')
+        sql = ' WHERE ' + ' AND '.join(where) if where else ''
+        conn = self._conn()
+        total = conn.execute('SELECT COUNT(*) FROM catalog' + sql, params).fetchone()[0]
+        order = DOCUMENT_SORTS.get(sort, DOCUMENT_SORTS['uploaded'])
+        # A name filter reads every row anyway: scanning the table and sorting
+        # the matches beats walking the sort index with a lookup per row.
+        source = 'catalog NOT INDEXED' if filters.get('q') else 'catalog'
+        rows = [dict(row) for row in conn.execute(f'SELECT * FROM {source}{sql} ORDER BY {order} LIMIT ? OFFSET ?',
+                                                  params + [limit, offset])]
+        links = {}
+        for row in conn.execute('SELECT name, framework, control_id FROM links WHERE name IN '
+                                '(SELECT value FROM json_each(?)) ORDER BY framework, control_id',
+                                (json.dumps([row['name'] for row in rows]),)):
+            links.setdefault(row['name'], []).append((row['framework'], row['control_id']))
+        for row in rows:
+            row['controls'] = links.get(row['name'], [])
+        return rows, total
+
+    def linked(self, name):
+        self._apply_pending()
+        return [(row['framework'], row['control_id']) for row in self._conn().execute(
+            'SELECT framework, control_id FROM links WHERE name = ? ORDER BY framework, control_id', (name,))]
+
+    def uploaders(self):
+        return [row['uploader'] for row in self._conn().execute(
+            'SELECT DISTINCT uploader FROM catalog WHERE uploader IS NOT NULL ORDER BY uploader')]
+
+    def stats(self):
+        self._apply_pending()
+        conn = self._conn()
+        return {
+            'documents': conn.execute('SELECT COUNT(*) FROM catalog').fetchone()[0],
+            'links': conn.execute('SELECT COUNT(*) FROM links').fetchone()[0]
+        }
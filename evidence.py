@@ -0,0 +1,285 @@
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+import uuid
+from contextlib import contextmanager, nullcontext
+
+try:
+    import fcntl
+except ImportError:  # Windows: appends are serialized within this process only
+    fcntl = None
+
+try:
+    import pypdf
+except ImportError:  # page counts fall back to scanning for /Type /Page
+    pypdf = None
+
+# Content-addressed store for uploaded evidence PDFs.
+#
+# Uploads are copied in UPLOAD_CHUNK_BYTES blocks to a temp file in
+# uploads/partial/ while their SHA-256 is computed, then renamed to
+# uploads/objects/<aa>/<sha256>.pdf.  The same content uploaded again (under
+# any name) is stored once; the database maps document names to their hash,
+# size and page count (see add_document_files in storage.py).
+#
+# Files too large for a single request go through a resumable upload: start()
+# reserves an id, the client PUTs consecutive byte ranges with append() (and
+# can ask status() for the offset to resume from after a dropped connection),
+# and finish() hashes and stores the assembled file.
+#
+# An object may only be deleted once no document lists it (release()), but an
+# upload of the same content can be between storing it and listing it.  So
+# _store() pins the object (a partial/<sha256>.<id>.pin file) until the caller
+# has recorded the document and calls unpin(), and both the store-or-skip step
+# and release()'s check-and-unlink run under one lock (objects.lock).
+#
+# append() and finish() hold an exclusive
+# lock on the partial file, so two PUTs of the same upload (a retry racing the
+# original, or two workers) are applied one after the other, each checking the
+# offset it was sent against what is on disk.
+
+UPLOAD_CHUNK_BYTES = 1024 * 1024
+# Browser uploads larger than this switch to the resumable protocol, in
+# RESUMABLE_CHUNK_BYTES pieces; both stay under the app's MAX_CONTENT_LENGTH.
+RESUMABLE_THRESHOLD = 8 * 1024 * 1024
+RESUMABLE_CHUNK_BYTES = 4 * 1024 * 1024
+MAX_UPLOAD_BYTES = int(os.environ.get('MAX_UPLOAD_BYTES', 512 * 1024 * 1024))
+PARTIAL_TTL_SECONDS = 24 * 3600
+UPLOAD_ID_RE = re.compile(r'^[0-9a-f]{32}$')
+SHA256_RE = re.compile(r'^[0-9a-f]{64}$')
+PAGE_RE = re.compile(rb'/Type\s*/Page(?![A-Za-z])')
+
+
+_partial_lock = threading.Lock()
+_objects_lock = threading.Lock()
+
+
+class UploadError(Exception):
+    pass
+
+
+class RangeMismatch(UploadError):
+    # The body of a resumable PUT does not fit its Content-Range
+    pass
+
+
+@contextmanager
+def locked_partial(part_path):
+    # The partial file opened for appending, locked against other appends
+    try:
+        f = os.fdopen(os.open(part_path, os.O_WRONLY | os.O_APPEND), 'ab')
+    except OSError:
+        raise UploadError('unknown upload')
+    with f, (_partial_lock if fcntl is None else nullcontext()):
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        try:
+            current = os.stat(part_path)
+        except OSError:
+            current = None
+        if current is None or not os.path.samestat(current, os.fstat(f.fileno())):
+            # finish() stored it while we waited
+            raise UploadError('unknown upload')
+        yield f
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(UPLOAD_CHUNK_BYTES), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def count_pages(path):
+    if pypdf is not None:
+        try:
+            return len(pypdf.PdfReader(path).pages)
+        except Exception:
+            pass
+    # Scan the raw file for page objects.  The last bytes of each block are
+    # carried over so a marker split across two blocks is counted once.
+    pages = 0
+    tail = b''
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(UPLOAD_CHUNK_BYTES), b''):
+            data = tail + block
+            cut = max(len(data) - 32, 0)
+            pages += sum(1 for match in PAGE_RE.finditer(data) if match.start() < cut)
+            tail = data[cut:]
+    return pages + len(PAGE_RE.findall(tail))
+
+
+class EvidenceStore:
+    def __init__(self, folder):
+        self.folder = os.path.abspath(folder)
+        self.objects = os.path.join(self.folder, 'objects')
+        self.partial = os.path.join(self.folder, 'partial')
+        os.makedirs(self.objects, exist_ok=True)
+        os.makedirs(self.partial, exist_ok=True)
+
+    def object_path(self, sha256):
+        if not SHA256_RE.match(sha256 or ''):
+            return None
+        return os.path.join(self.objects, sha256[:2], f'{sha256}.pdf')
+
+    def receive(self, stream, max_bytes=MAX_UPLOAD_BYTES):
+        # Single-request upload: copy the stream in chunks while hashing it.
+        digest = hashlib.sha256()
+        size = 0
+        tmp_path = os.path.join(self.partial, f'{uuid.uuid4().hex}.tmp')
+        try:
+            with open(tmp_path, 'wb') as f:
+                while True:
+                    chunk = stream.read(UPLOAD_CHUNK_BYTES)
+                    if not chunk:
+                        break
+                    size += len(chunk)
+                    if size > max_bytes:
+                        raise UploadError(f'upload larger than {max_bytes} bytes')
+                    digest.update(chunk)
+                    f.write(chunk)
+            return self._store(tmp_path, digest.hexdigest(), size)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    @contextmanager
+    def _objects_locked(self):
+        with _objects_lock, open(os.path.join(self.folder, 'objects.lock'), 'a') as f:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            yield
+
+    def _pins(self, sha256):
+        prefix = f'{sha256}.'
+        return [entry.path for entry in os.scandir(self.partial)
+                if entry.name.startswith(prefix) and entry.name.endswith('.pin')]
+
+    def _store(self, tmp_path, sha256, size):
+        # Pinned until unpin(sha256)
+        path = self.object_path(sha256)
+        synced = False
+        if not os.path.exists(path):
+            with open(tmp_path, 'rb+') as f:
+                os.fsync(f.fileno())
+            synced = True
+        with self._objects_locked():
+            if not os.path.exists(path):
+                if not synced:
+                    # Released since the check above
+                    with open(tmp_path, 'rb+') as f:
+                        os.fsync(f.fileno())
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                os.replace(tmp_path, path)
+            open(os.path.join(self.partial, f'{sha256}.{uuid.uuid4().hex}.pin'), 'w').close()
+        return {
+            'sha256': sha256,
+            'size': size,
+            'pages': count_pages(path),
+            'uploaded': time.time()
+        }
+
+    def unpin(self, sha256):
+        # The upload that stored sha256 has been recorded (or dropped)
+        for path in self._pins(sha256)[:1]:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def release(self, sha256, in_use):
+        # Deletes the stored object unless in_use() (a document lists it) or an
+        # upload still has it pinned; True if it was deleted.
+        path = self.object_path(sha256)
+        if path is None:
+            return False
+        with self._objects_locked():
+            if in_use() or self._pins(sha256) or not os.path.exists(path):
+                return False
+            os.remove(path)
+            return True
+
+    # Resumable uploads
+
+    def _paths(self, upload_id):
+        if not UPLOAD_ID_RE.match(upload_id):
+            raise UploadError('unknown upload')
+        base = os.path.join(self.partial, upload_id)
+        return base + '.json', base + '.part'
+
+    def start(self, filename, size):
+        if not 0 < size <= MAX_UPLOAD_BYTES:
+            raise UploadError(f'size must be between 1 and {MAX_UPLOAD_BYTES} bytes')
+        self.prune()
+        upload_id = uuid.uuid4().hex
+        meta_path, part_path = self._paths(upload_id)
+        open(part_path, 'wb').close()
+        with open(meta_path, 'w') as f:
+            json.dump({'filename': filename, 'size': size, 'created': time.time()}, f)
+        return upload_id
+
+    def status(self, upload_id):
+        meta_path, part_path = self._paths(upload_id)
+        try:
+            with open(meta_path) as f:
+                meta = json.load(f)
+            meta['offset'] = os.path.getsize(part_path)
+        except (OSError, ValueError):
+            raise UploadError('unknown upload')
+        meta['id'] = upload_id
+        return meta
+
+    def append(self, upload_id, offset, stream, end=None):
+        # Writes the bytes for [offset, end) and returns the new offset.  A
+        # retried chunk that was already received is rejected with the current
+        # offset so the client can continue from there; a body running past
+        # end is cut back and rejected.  A short one (dropped connection) is
+        # kept, to be resumed.
+        meta = self.status(upload_id)
+        _, part_path = self._paths(upload_id)
+        with locked_partial(part_path) as f:
+            start = os.fstat(f.fileno()).st_size
+            if offset != start:
+                raise UploadError(f'expected offset {start}')
+            while True:
+                chunk = stream.read(UPLOAD_CHUNK_BYTES)
+                if not chunk:
+                    break
+                if end is not None and offset + len(chunk) > end:
+                    f.truncate(start)
+                    raise RangeMismatch('more data than the Content-Range')
+                if offset + len(chunk) > meta['size']:
+                    f.truncate(start)
+                    raise UploadError('more data than the declared size')
+                f.write(chunk)
+                offset += len(chunk)
+        return offset
+
+    def finish(self, upload_id):
+        meta = self.status(upload_id)
+        meta_path, part_path = self._paths(upload_id)
+        with locked_partial(part_path) as f:
+            # Re-read under the lock: an append may have been in flight
+            offset = os.fstat(f.fileno()).st_size
+            if offset != meta['size']:
+                raise UploadError(f"upload incomplete: {offset} of {meta['size']} bytes")
+            try:
+                return meta['filename'], self._store(part_path, file_sha256(part_path), meta['size'])
+            finally:
+                for path in (part_path, meta_path):
+                    if os.path.exists(path):
+                        os.remove(path)
+
+    def prune(self):
+        # Abandoned partial uploads, and pins of uploads that never finished.
+        cutoff = time.time() - PARTIAL_TTL_SECONDS
+        for entry in os.scandir(self.partial):
+            try:
+                if entry.stat().st_mtime < cutoff:
+                    os.remove(entry.path)
+            except OSError:
+                pass
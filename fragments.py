@@ -0,0 +1,72 @@
+import html
+import re
+import threading
+
+from markupsafe import Markup
+
+# Pre-rendered catalog fragments.  A chapter of the mapping pages (its
+# controls, titles and contents) only changes with the framework version, so
+# its block is rendered once per template, framework version and chapter and
+# kept as static text with holes: the template marks the per-request parts
+# (e.g. suggestions) with slot(key) and render() splices them in.  prerender()
+# fills the cache for every framework, so requests only render the holes.
+
+SLOT_PATTERN = re.compile(r'<!--slot:(.*?)-->')
+
+
+def slot(key):
+    return Markup('<!--slot:%s-->') % key
+
+
+def split_slots(text):
+    # ([static text, ...], [slot key, ...]) with one more text than keys
+    pieces = SLOT_PATTERN.split(text)
+    return pieces[0::2], [html.unescape(key) for key in pieces[1::2]]
+
+
+class FragmentCache:
+    def __init__(self, env):
+        self.env = env
+        self._lock = threading.Lock()
+        self._entries = {}
+        self.hits = 0
+        self.misses = 0
+
+    def parts(self, template_name, block, catalog, chapter):
+        # get_template() is a lookup in Jinja's own cache; comparing the
+        # template object also drops fragments of reloaded templates.
+        template = self.env.get_template(template_name)
+        key = (template_name, block, catalog.name, chapter)
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is not None and cached[0] == catalog.version and cached[1] is template:
+                self.hits += 1
+                return cached[2]
+            self.misses += 1
+
+        context = template.new_context({'framework': catalog, 'chapter_id': chapter,
+                                        'chapter': catalog.tree[chapter], 'slot': slot})
+        parts = split_slots(''.join(template.blocks[block](context)))
+        with self._lock:
+            self._entries[key] = (catalog.version, template, parts)
+        return parts
+
+    def render(self, template_name, block, catalog, chapter, fill):
+        # fill(key) returns the markup of one slot ('' to leave it empty)
+        texts, keys = self.parts(template_name, block, catalog, chapter)
+        out = [texts[0]]
+        for key, text in zip(keys, texts[1:]):
+            out.append(fill(key))
+            out.append(text)
+        return Markup(''.join(out))
+
+    def prerender(self, frameworks, block='chapter'):
+        for name in frameworks.names():
+            catalog = frameworks.get(name)
+            if catalog is None:
+                continue
+            for chapter in catalog.chapters:
+                self.parts(catalog.settings['map_template'], block, catalog, chapter)
+
+    def stats(self):
+        return {'hits': self.hits, 'misses': self.misses, 'entries': len(self._entries)}
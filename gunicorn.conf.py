@@ -0,0 +1,64 @@
+import gc
+import multiprocessing
+import os
+import tempfile
+
+# Production serving: gunicorn -c gunicorn.conf.py app:app
+#
+# The app is imported once in the master (preload_app) and warmed up before the
+# workers are forked: framework catalogs, suggestion vectors, chapter fragments
+# and compiled templates are built there and shared copy-on-write by every
+# worker (gc.freeze() keeps the collector from touching, and so copying, those
+# pages).  Tenants are opened lazily by each worker, so no database connection
+# or thread crosses a fork.
+#
+# Each worker serves WEB_THREADS requests at a time and is replaced after about
+# MAX_REQUESTS requests (plus jitter, so they do not all restart together); a
+# replaced worker finishes its requests in flight first.
+#
+# Reloads without dropping requests (the listening socket is never closed):
+#   kill -HUP <master>    new workers with the new configuration, then the old
+#                         ones stop gracefully (same application code)
+#   kill -USR2 <master>   new master and workers running the new code next to
+#                         the old ones; then kill -WINCH <old master> to stop
+#                         its workers gracefully and kill -QUIT <old master>
+#   kill -TTIN / -TTOU    one worker more / less
+
+bind = os.environ.get('BIND', '0.0.0.0:5000')
+workers = int(os.environ.get('WEB_CONCURRENCY', multiprocessing.cpu_count()))
+threads = int(os.environ.get('WEB_THREADS', 4))
+worker_class = 'gthread'
+preload_app = True
+max_requests = int(os.environ.get('MAX_REQUESTS', 1000))
+max_requests_jitter = int(os.environ.get('MAX_REQUESTS_JITTER', max_requests // 10))
+graceful_timeout = int(os.environ.get('GRACEFUL_TIMEOUT', 30))
+timeout = int(os.environ.get('WORKER_TIMEOUT', 120))  # reports and bulk uploads can be slow
+keepalive = 5
+accesslog = os.environ.get('ACCESS_LOG')
+# Workers publish their metrics counts here so that /metrics, answered by any
+# one worker, reports them all (see metrics.py); read when the app is imported.
+if not os.environ.get('METRICS_FOLDER'):
+    os.environ['METRICS_FOLDER'] = tempfile.mkdtemp(prefix='audit-metrics-')
+
+
+def when_ready(server):
+    # Called in the master once the socket is bound, before the first fork
+    import app
+    app.warm_up()
+    gc.freeze()
+    server.log.info('Shared catalogs and templates ready; forking %s workers x %s threads', workers, threads)
+
+
+def post_fork(server, worker):
+    from metrics import registry
+    registry.start()
+
+
+def worker_exit(server, worker):
+    from metrics import registry
+    registry.flush()
+
+
+def child_exit(server, worker):
+    from metrics import registry
+    registry.retire(worker.pid)
@@ -0,0 +1,119 @@
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import plotly
+import plotly.graph_objects as go
+
+from metrics import timed
+
+# Audit heatmaps.  Scores are laid out as a chapters x controls matrix in one
+# vectorized step (rows are ragged, so a mask marks the padding cells), the
+# chapter aggregates are reduced from the same matrix, and the serialized
+# figure is memoized per framework version and score vector: an unchanged
+# dashboard costs one dict lookup.
+
+HEATMAP_CACHE_SIZE = 32
+# Statuses counted as non-conformities (see evaluation_status in app.py);
+# unevaluated controls and LOPDP's plain "Evaluado" are not.
+NONCONFORMITY_STATUSES = frozenset(('No conformidad mayor', 'No conformidad menor', 'Incumple'))
+
+
+def score_vector(catalog, db_controls):
+    # Catalog order; controls without an evaluation count as 0.
+    return np.fromiter((db_controls.get(control_id, {}).get('score', 0) for control_id in catalog.ids),
+                       dtype=np.float64, count=len(catalog))
+
+
+def nonconformity_vector(catalog, db_controls):
+    return np.fromiter((db_controls.get(control_id, {}).get('status') in NONCONFORMITY_STATUSES
+                        for control_id in catalog.ids), dtype=bool, count=len(catalog))
+
+
+def score_matrix(catalog, scores):
+    lengths = np.array([end - start for start, end in (catalog.chapter_ranges[chapter]
+                                                        for chapter in catalog.chapters)])
+    starts = np.cumsum(lengths) - lengths
+    rows = np.repeat(np.arange(len(lengths)), lengths)
+    cols = np.arange(len(scores)) - np.repeat(starts, lengths)
+    matrix = np.zeros((len(lengths), lengths.max(initial=0)))
+    mask = np.ones(matrix.shape, dtype=bool)
+    matrix[rows, cols] = scores
+    mask[rows, cols] = False
+    return np.ma.masked_array(matrix, mask)
+
+
+def chapter_aggregates(catalog, matrix, flags):
+    # flags: score_matrix of the nonconformity_vector
+    counts = matrix.count(axis=1)
+    means = matrix.mean(axis=1)
+    minimums = matrix.min(axis=1)
+    nonconformities = flags.filled(0).sum(axis=1)
+    aggregates = []
+    for i, chapter in enumerate(catalog.chapters):
+        empty = counts[i] == 0
+        aggregates.append({
+            'chapter': chapter,
+            'title': catalog.chapter_titles[chapter],
+            'controls': int(counts[i]),
+            'mean': None if empty else round(float(means[i]), 1),
+            'min': None if empty else int(minimums[i]),
+            'nonconformities': int(nonconformities[i])
+        })
+    return aggregates
+
+
+def build_figure(audit_type, catalog, matrix):
+    # plotly would ship a numpy z as a base64 typed array, which the
+    # plotly.js bundle in heatmap.html cannot read; masked cells become null.
+    with timed('heatmap_figure'):
+        fig = go.Figure(data=go.Heatmap(
+            z=matrix.tolist(),
+            x=catalog.ids, # Controls
+            y=catalog.chapters, # Chapters
+            colorscale='Viridis'))
+
+        fig.update_layout(
+            title=f'Diagrama de Calor de Calificaciones de Auditoría - {audit_type.upper()}',
+            xaxis_title='Controles',
+            yaxis_title='Capítulos',
+            xaxis_nticks=36 # Adjust as needed for readability
+        )
+    with timed('heatmap_serialize'):
+        return json.dumps(fig, cls=plotly.utils.PlotlyJSONEncoder)
+
+
+class HeatmapCache:
+    def __init__(self, size=HEATMAP_CACHE_SIZE):
+        self.size = size
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, audit_type, catalog, db_controls):
+        # Returns (figure JSON, chapter aggregates).
+        scores = score_vector(catalog, db_controls)
+        flags = nonconformity_vector(catalog, db_controls)
+        key = (audit_type, catalog.version, hashlib.sha1(scores.tobytes() + flags.tobytes()).hexdigest())
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return cached
+            self.misses += 1
+
+        matrix = score_matrix(catalog, scores)
+        cached = (build_figure(audit_type, catalog, matrix),
+                  chapter_aggregates(catalog, matrix, score_matrix(catalog, flags)))
+        with self._lock:
+            self._entries[key] = cached
+            while len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+        return cached
+
+    def stats(self):
+        return {'hits': self.hits, 'misses': self.misses, 'entries': len(self._entries)}
@@ -0,0 +1,170 @@
+import json
+import threading
+import time
+import zlib
+
+from search import connect
+
+# Audit history.  Every evaluation change is stored as one row of
+# history.sqlite3 holding only the fields that changed, as {field: [old, new]},
+# with its time and user.  Every SNAPSHOT_EVERY changes of a framework the
+# evaluation state of all its controls is written as a compressed snapshot, so
+# the state at any time is the latest snapshot before it plus at most
+# SNAPSHOT_EVERY deltas, both found through indexes.  The first change of a
+# framework seeds a baseline snapshot from the database.
+
+HISTORY_FIELDS = ('score', 'status', 'comment')
+SNAPSHOT_EVERY = 200
+HISTORY_SCHEMA = """
+CREATE TABLE IF NOT EXISTS changes (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    framework TEXT NOT NULL,
+    control_id TEXT NOT NULL,
+    changed REAL NOT NULL,
+    user TEXT,
+    delta TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_changes_time ON changes (framework, changed);
+CREATE INDEX IF NOT EXISTS idx_changes_control ON changes (framework, control_id, id);
+CREATE TABLE IF NOT EXISTS snapshots (
+    framework TEXT NOT NULL,
+    change_id INTEGER NOT NULL,
+    taken REAL NOT NULL,
+    state BLOB NOT NULL,
+    PRIMARY KEY (framework, change_id)
+);
+CREATE INDEX IF NOT EXISTS idx_snapshots_time ON snapshots (framework, taken);
+"""
+
+
+def evaluation(record):
+    # The tracked fields of a control record
+    return {field: record[field] for field in HISTORY_FIELDS if record and record.get(field) is not None}
+
+
+def changed_fields(old, new):
+    old, new = evaluation(old), evaluation(new)
+    return {field: [old.get(field), new.get(field)] for field in HISTORY_FIELDS
+            if old.get(field) != new.get(field)}
+
+
+def apply_delta(state, control_id, delta):
+    record = state.setdefault(control_id, {})
+    for field, (old, new) in delta.items():
+        if new is None:
+            record.pop(field, None)
+        else:
+            record[field] = new
+    if not record:
+        del state[control_id]
+
+
+def pack(state):
+    return zlib.compress(json.dumps(state, separators=(',', ':')).encode())
+
+
+def unpack(blob):
+    return json.loads(zlib.decompress(blob))
+
+
+class AuditHistory:
+    def __init__(self, path, store):
+        self.path = path
+        self.store = store
+        self._local = threading.local()
+        self._conn().executescript(HISTORY_SCHEMA)
+
+    def _conn(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._local.conn = connect(self.path)
+        return conn
+
+    def record(self, framework, changes, user=None):
+        # changes: [(control_id, old record, new record), ...] from one write
+        deltas = [(control_id, delta) for control_id, old, new in changes
+                  for delta in [changed_fields(old, new)] if delta]
+        if not deltas:
+            return 0
+        conn = self._conn()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            if not conn.execute('SELECT 1 FROM snapshots WHERE framework = ? LIMIT 1', (framework,)).fetchall():
+                self._seed(conn, framework, changes)
+            now = time.time()
+            for control_id, delta in deltas:
+                change_id = conn.execute(
+                    'INSERT INTO changes (framework, control_id, changed, user, delta) VALUES (?, ?, ?, ?, ?)',
+                    (framework, control_id, now, user, json.dumps(delta, separators=(',', ':')))).lastrowid
+            snapshot_id = conn.execute('SELECT MAX(change_id) FROM snapshots WHERE framework = ?',
+                                       (framework,)).fetchone()[0]
+            if change_id - snapshot_id >= SNAPSHOT_EVERY:
+                # ids are shared by all frameworks, so this errs on the early side
+                state = self._state(conn, framework, change_id, None)
+                conn.execute('INSERT INTO snapshots (framework, change_id, taken, state) VALUES (?, ?, ?, ?)',
+                             (framework, change_id, now, pack(state)))
+            conn.execute('COMMIT')
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+        return len(deltas)
+
+    def _seed(self, conn, framework, changes):
+        # Baseline: the database as it was before this write
+        state = {control_id: evaluation(record) for control_id, record in self.store.controls(framework).items()}
+        for control_id, old, new in changes:
+            state[control_id] = evaluation(old)
+        state = {control_id: record for control_id, record in state.items() if record}
+        last = conn.execute('SELECT COALESCE(MAX(id), 0) FROM changes').fetchone()[0]
+        conn.execute('INSERT INTO snapshots (framework, change_id, taken, state) VALUES (?, ?, ?, ?)',
+                     (framework, last, time.time(), pack(state)))
+
+    def _state(self, conn, framework, until_id, until_time):
+        # Latest snapshot at or before the bound, plus the deltas after it.
+        if until_time is None:
+            snapshot = conn.execute(
+                'SELECT change_id, taken, state FROM snapshots WHERE framework = ? AND change_id <= ? '
+                'ORDER BY change_id DESC LIMIT 1', (framework, until_id)).fetchall()
+        else:
+            snapshot = conn.execute(
+                'SELECT change_id, taken, state FROM snapshots WHERE framework = ? AND taken <= ? '
+                'ORDER BY taken DESC, change_id DESC LIMIT 1', (framework, until_time)).fetchall()
+        if not snapshot:
+            return None
+        state = unpack(snapshot[0]['state'])
+        sql = 'SELECT control_id, delta FROM changes WHERE framework = ? AND id > ?'
+        params = [framework, snapshot[0]['change_id']]
+        if until_time is None:
+            sql += ' AND id <= ?'
+            params.append(until_id)
+        else:
+            sql += ' AND changed <= ?'
+            params.append(until_time)
+        for row in conn.execute(sql + ' ORDER BY id', params):
+            apply_delta(state, row['control_id'], json.loads(row['delta']))
+        return state
+
+    def state_at(self, framework, when):
+        # {control_id: {'score', 'status', 'comment'}} as of the timestamp, or
+        # None if the framework has no history yet or it starts later.
+        return self._state(self._conn(), framework, None, when)
+
+    def trend(self, framework, control_id, limit=None):
+        # [{'changed', 'user', 'old', 'score'}] for each score change of the
+        # control, oldest first; limit keeps the most recent ones
+        sql = ("SELECT id, changed, user, json_extract(delta, '$.score') AS score FROM changes "
+               "WHERE framework = ? AND control_id = ? AND json_extract(delta, '$.score') IS NOT NULL ORDER BY id")
+        params = [framework, control_id]
+        if limit is not None:
+            sql = f'SELECT * FROM ({sql} DESC LIMIT ?) ORDER BY id'
+            params.append(limit)
+        return [{'changed': row['changed'], 'user': row['user'], 'old': old, 'score': new}
+                for row in self._conn().execute(sql, params)
+                for old, new in [json.loads(row['score'])]]
+
+    def stats(self):
+        conn = self._conn()
+        return {
+            'changes': conn.execute('SELECT COUNT(*) FROM changes').fetchone()[0],
+            'snapshots': conn.execute('SELECT COUNT(*) FROM snapshots').fetchone()[0]
+        }
@@ -0,0 +1,221 @@
+import bisect
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+# Request and phase timings in the Prometheus text format, served on /metrics.
+#
+# A histogram keeps a count per bucket and the sum for each combination of
+# label values behind one lock, so observing is a bisect and two additions:
+# cheap enough to stay on in production.  Gauges (database size, documents,
+# ...) are read when scraped.
+#
+# Under gunicorn every worker counts its own requests but a scrape reaches only
+# one of them.  With METRICS_FOLDER set (gunicorn.conf.py sets it) each worker
+# writes its counts to <folder>/<pid>.json every FLUSH_SECONDS and when it
+# exits, the master folds the files of exited workers into retired.json, and a
+# scrape adds its own live counts, the other workers' files and retired.json.
+#
+# /metrics needs the METRICS_TOKEN bearer token or an auditor's session (see
+# app.py); the tenant gauges name organizations.
+
+METRICS_FOLDER = os.environ.get('METRICS_FOLDER')
+FLUSH_SECONDS = 1.0
+RETIRED_FILE = 'retired.json'
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def format_labels(names, values, extra=''):
+    pairs = ['%s="%s"' % (name, str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n'))
+             for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def format_value(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Histogram:
+    def __init__(self, name, help, labels, buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        # label values -> [count per bucket..., count above the last, sum]
+        self._series = {}
+
+    def observe(self, value, *labels):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+            series[index] += 1
+            series[-1] += value
+
+    @contextmanager
+    def time(self, *labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, *labels)
+
+    def snapshot(self):
+        with self._lock:
+            return {labels: list(series) for labels, series in self._series.items()}
+
+    def reset(self):
+        with self._lock:
+            self._series.clear()
+
+    def render(self, series):
+        lines = [f'# HELP {self.name} {self.help}', f'# TYPE {self.name} histogram']
+        for labels in sorted(series):
+            counts = series[labels]
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += count
+                le = 'le="%s"' % ('+Inf' if bound == float('inf') else format_value(float(bound)))
+                lines.append(f'{self.name}_bucket{format_labels(self.labels, labels, le)} {cumulative}')
+            lines.append(f'{self.name}_sum{format_labels(self.labels, labels)} {format_value(float(counts[-1]))}')
+            lines.append(f'{self.name}_count{format_labels(self.labels, labels)} {cumulative}')
+        return lines
+
+
+class Gauge:
+    def __init__(self, name, help, labels, collect):
+        # collect() -> {label values: value}
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self.collect = collect
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.help}', f'# TYPE {self.name} gauge']
+        for labels, value in sorted(self.collect().items()):
+            lines.append(f'{self.name}{format_labels(self.labels, labels)} {format_value(value)}')
+        return lines
+
+
+class Metrics:
+    def __init__(self, folder=METRICS_FOLDER):
+        self.folder = folder
+        self.histograms = {}
+        self.gauges = []
+        self._flusher = None
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+
+    def histogram(self, name, help, labels, buckets=LATENCY_BUCKETS):
+        histogram = self.histograms[name] = Histogram(name, help, labels, buckets)
+        return histogram
+
+    def gauge(self, name, help, labels, collect):
+        gauge = Gauge(name, help, labels, collect)
+        self.gauges.append(gauge)
+        return gauge
+
+    def _path(self, pid):
+        return os.path.join(self.folder, f'{pid}.json')
+
+    @staticmethod
+    def _read(path):
+        try:
+            with open(path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            # Gone (its worker was just retired) or not a metrics file
+            return None
+
+    def _write(self, path, data):
+        tmp_path = f'{path}.{os.getpid()}.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(data, f)
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def _dump(snapshots):
+        return {name: [[list(labels), series] for labels, series in series_by_labels.items()]
+                for name, series_by_labels in snapshots.items()}
+
+    def _add(self, totals, data):
+        for name, items in data.items():
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                continue
+            target = totals.setdefault(name, {})
+            for labels, series in items:
+                labels = tuple(labels)
+                if len(series) != len(histogram.buckets) + 2:
+                    continue  # written with other buckets
+                current = target.get(labels)
+                target[labels] = series if current is None else [a + b for a, b in zip(current, series)]
+
+    def start(self):
+        # In a new worker: drop counts inherited from the master and publish
+        # this worker's counts from now on.
+        for histogram in self.histograms.values():
+            histogram.reset()
+        if self.folder and self._flusher is None:
+            self._flusher = threading.Thread(target=self._flush_loop, daemon=True)
+            self._flusher.start()
+
+    def _flush_loop(self):
+        while True:
+            time.sleep(FLUSH_SECONDS)
+            self.flush()
+
+    def flush(self):
+        if self.folder:
+            self._write(self._path(os.getpid()),
+                        self._dump({name: histogram.snapshot() for name, histogram in self.histograms.items()}))
+
+    def retire(self, pid):
+        # Master only, once the worker has exited: its final counts move to
+        # retired.json so they outlive it.
+        if not self.folder:
+            return
+        path = self._path(pid)
+        data = self._read(path)
+        if data is None:
+            return
+        totals = {}
+        self._add(totals, self._read(os.path.join(self.folder, RETIRED_FILE)) or {})
+        self._add(totals, data)
+        self._write(os.path.join(self.folder, RETIRED_FILE), self._dump(totals))
+        os.remove(path)
+
+    def collect(self):
+        # {histogram name: {label values: series}} of every worker
+        totals = {name: histogram.snapshot() for name, histogram in self.histograms.items()}
+        if self.folder:
+            own = f'{os.getpid()}.json'
+            for entry in os.scandir(self.folder):
+                if entry.name != own and entry.name.endswith('.json'):
+                    self._add(totals, self._read(entry.path) or {})
+        return totals
+
+    def render(self):
+        lines = []
+        totals = self.collect()
+        for name, histogram in self.histograms.items():
+            lines += histogram.render(totals.get(name, {}))
+        for gauge in self.gauges:
+            lines += gauge.render()
+        return '\n'.join(lines) + '\n'
+
+
+registry = Metrics()
+phase_seconds = registry.histogram('audit_phase_duration_seconds',
+                                   'Time spent in storage, report and heatmap phases', ('phase',))
+
+
+def timed(phase):
+    # `with timed('storage_load'):` records the block's duration
+    return phase_seconds.time(phase)
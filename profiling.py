@@ -0,0 +1,164 @@
+import json
+import os
+import re
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+
+# On-demand request profiles.  A request is profiled when a user with one of
+# PROFILE_ROLES (auditors by default; they also list and download profiles)
+# asks for it (X-Profile: 1 header or ?profile=1) or at random with
+# PROFILE_SAMPLE_RATE.  While it runs, a sampler thread records the request
+# thread's stack every PROFILE_INTERVAL seconds, so the request itself pays
+# nothing per call; the GIL switch interval, which is process-wide, is lowered
+# to the same period until the profile stops, or a busy request would keep the
+# sampler waiting 5 ms.  Only one request per worker is profiled at a time; a
+# request arriving meanwhile simply runs unprofiled.
+# Stacks are written in collapsed format, one "root;...;leaf count" line each,
+# which flamegraph.pl, inferno and speedscope read as is, next to a JSON summary
+# of the request.  Only the newest PROFILES_KEPT profiles are kept.
+
+PROFILES_FOLDER = 'profiles'
+PROFILE_SAMPLE_RATE = float(os.environ.get('PROFILE_SAMPLE_RATE', 0))
+PROFILE_INTERVAL = float(os.environ.get('PROFILE_INTERVAL', 0.001))
+PROFILES_KEPT = int(os.environ.get('PROFILES_KEPT', 200))
+PROFILE_ROLES = frozenset(os.environ.get('PROFILE_ROLES', 'auditor').split(','))
+PROFILE_ID_RE = re.compile(r'^\d{8}-\d{6}-[0-9a-f]{8}$')
+
+_labels = {}
+_active = threading.Lock()
+
+
+def frame_label(code):
+    # "function (file:first line)"; files below site-packages keep their package path
+    label = _labels.get(code)
+    if label is None:
+        path = code.co_filename
+        marker = path.rfind('site-packages' + os.sep)
+        path = path[marker + len('site-packages') + 1:] if marker >= 0 else os.path.basename(path)
+        label = _labels[code] = f'{code.co_name} ({path}:{code.co_firstlineno})'
+    return label
+
+
+def start_sampler(thread_id, interval=PROFILE_INTERVAL):
+    # A running StackSampler, or None while another profile runs
+    if not _active.acquire(blocking=False):
+        return None
+    try:
+        sampler = StackSampler(thread_id, interval)
+    except BaseException:
+        _active.release()
+        raise
+    sampler._holds_active = True
+    return sampler
+
+
+class StackSampler:
+    # Samples one thread's stack from a background thread until stop(); start
+    # it with start_sampler(), which holds the one-at-a-time lock until stop()
+    def __init__(self, thread_id, interval=PROFILE_INTERVAL):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self.samples = 0
+        self.duration = None
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._holds_active = False
+        self._switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(min(self._switch_interval, interval))
+        self._started = time.perf_counter()
+        try:
+            self._thread.start()
+        except BaseException:
+            sys.setswitchinterval(self._switch_interval)
+            raise
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                break
+            stack = []
+            while frame is not None:
+                stack.append(frame_label(frame.f_code))
+                frame = frame.f_back
+            self.stacks[';'.join(reversed(stack))] += 1
+            self.samples += 1
+
+    def stop(self):
+        if self._stop.is_set():
+            return self
+        self.duration = time.perf_counter() - self._started
+        self._stop.set()
+        try:
+            self._thread.join()
+        finally:
+            sys.setswitchinterval(self._switch_interval)
+            if self._holds_active:
+                self._holds_active = False
+                _active.release()
+        return self
+
+
+class ProfileStore:
+    def __init__(self, folder=PROFILES_FOLDER, kept=PROFILES_KEPT):
+        self.folder = folder
+        self.kept = kept
+        self._lock = threading.Lock()
+        os.makedirs(folder, exist_ok=True)
+
+    def path(self, profile_id, extension='folded'):
+        if not PROFILE_ID_RE.match(profile_id or ''):
+            return None
+        return os.path.join(self.folder, f'{profile_id}.{extension}')
+
+    def save(self, sampler, info):
+        # info: the request's method, path, endpoint, status, user and trigger
+        profile_id = time.strftime('%Y%m%d-%H%M%S') + '-' + uuid.uuid4().hex[:8]
+        with open(self.path(profile_id), 'w') as f:
+            for stack, count in sampler.stacks.most_common():
+                f.write(f'{stack} {count}\n')
+        summary = dict(info, id=profile_id, time=time.time(), duration=sampler.duration,
+                       samples=sampler.samples, interval=sampler.interval)
+        # The summary goes last: a listed profile is complete.
+        tmp_path = self.path(profile_id, 'json.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump(summary, f)
+        os.replace(tmp_path, self.path(profile_id, 'json'))
+        self.prune()
+        return profile_id
+
+    def _ids(self):
+        # Oldest first: ids start with their time
+        return sorted(entry.name[:-5] for entry in os.scandir(self.folder)
+                      if entry.name.endswith('.json') and PROFILE_ID_RE.match(entry.name[:-5]))
+
+    def prune(self):
+        with self._lock:
+            ids = self._ids()
+            for profile_id in ids[:max(len(ids) - self.kept, 0)]:
+                for extension in ('json', 'folded'):
+                    try:
+                        os.remove(self.path(profile_id, extension))
+                    except FileNotFoundError:
+                        pass
+
+    def get(self, profile_id):
+        path = self.path(profile_id, 'json')
+        if path is None:
+            return None
+        try:
+            with open(path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def slowest(self, limit=50):
+        profiles = [profile for profile in map(self.get, self._ids()) if profile is not None]
+        return sorted(profiles, key=lambda profile: profile['duration'], reverse=True)[:limit]
+
+    def stats(self):
+        return {'profiles': len(self._ids()), 'kept': self.kept, 'sample_rate': PROFILE_SAMPLE_RATE}
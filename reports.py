@@ -0,0 +1,348 @@
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from xml.sax.saxutils import escape
+
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import letter, landscape
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.units import inch
+from reportlab.lib.utils import simpleSplit
+
+from metrics import timed
+
+# PDF audit reports.  Rendering runs on a small thread pool so a large audit
+# never blocks a request.  Each job keeps a reports/<job_id>.json status file,
+# so any worker can answer /jobs/<id>, and renders into
+# reports/<job_id>.pdf.tmp; the finished PDF is then moved into the cache.
+#
+# The cache, reports/cache/<key>.pdf, is content-addressed: the key is a hash of
+# everything the report depends on (see report_key), so an unchanged audit is
+# served straight from it and any change to a score, comment or mapping simply
+# produces a new key.  A job's download is the cache entry of its key.  Entries
+# are evicted least-recently-used first once REPORT_CACHE_BYTES is exceeded.
+
+REPORTS_FOLDER = 'reports'
+REPORT_SLOTS = int(os.environ.get('REPORT_SLOTS', 2))
+# Bump whenever build_report changes what ends up in the PDF.
+REPORT_TEMPLATE_VERSION = 2
+# Rows per Table flowable.  Reportlab lays out (and re-splits at every page
+# break) a whole Table at once, so one table per audit grows quadratically;
+# small tables keep each layout pass and its memory bounded.
+REPORT_CHUNK_ROWS = 100
+REPORT_HEADER = ['Control', 'Título', 'Puntuación', 'Estado', 'Comentario', 'Documentos Relacionados']
+REPORT_COL_WIDTHS = [1.2*inch, 1.5*inch, 0.8*inch, 1.2*inch, 2.5*inch, 1.5*inch]
+REPORT_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+    ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, 0), 10),
+    ('FONTSIZE', (0, 1), (-1, -1), 8),
+    ('LEADING', (0, 1), (-1, -1), 10),
+    ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+    ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+    ('GRID', (0, 0), (-1, -1), 1, colors.black),
+    ('BOX', (0, 0), (-1, -1), 1, colors.black),
+    ('ALIGN', (1, 1), (1, -1), 'LEFT'), # Alinear título,
+    ('ALIGN', (4, 1), (5, -1), 'LEFT'), # comentario y documentos a la izquierda
+])
+REPORT_CACHE_BYTES = int(os.environ.get('REPORT_CACHE_BYTES', 256 * 1024 * 1024))
+REPORT_KEY_RE = re.compile(r'^[0-9a-f]{64}$')
+MAX_QUEUED_JOBS = 32
+JOB_TTL_SECONDS = 3600
+JOB_ID_RE = re.compile(r'^[0-9a-f]{32}$')
+
+
+class QueueFull(Exception):
+    pass
+
+
+def wrap_cell(text, column):
+    # Wrap long titles and comments to the column width up front; plain
+    # multi-line strings lay out far faster than a Paragraph per cell.
+    width = REPORT_COL_WIDTHS[column] - 12  # default cell padding
+    return '\n'.join(simpleSplit(text, 'Helvetica', 8, width))
+
+
+def report_story(audit_type, catalog, db_controls):
+    # Yields the report's flowables chapter by chapter: a heading, then the
+    # chapter's rows in REPORT_CHUNK_ROWS-sized tables whose header row repeats
+    # on every page the table spans.
+    styles = getSampleStyleSheet()
+    chapter_style = ParagraphStyle('Chapter', parent=styles['h2'], keepWithNext=1)
+
+    yield Paragraph(f"Reporte de Auditoría - {audit_type.upper()}", styles['h1'])
+    yield Spacer(1, 0.25 * inch)
+
+    for chapter in catalog.chapters:
+        yield Paragraph(escape(f"{chapter} - {catalog.chapter_titles[chapter]}"), chapter_style)
+        start, end = catalog.chapter_ranges[chapter]
+        for chunk_start in range(start, end, REPORT_CHUNK_ROWS):
+            data = [REPORT_HEADER]
+            for entry in catalog.ordered[chunk_start:min(chunk_start + REPORT_CHUNK_ROWS, end)]:
+                control_data = db_controls.get(entry.id, {})
+                score = control_data.get('score', 0)
+                comment = control_data.get('comment', '')
+                documents = ', '.join(control_data.get('documents', []))
+                status = control_data.get('status', 'Incumplimiento')
+
+                data.append([entry.id, wrap_cell(entry.title, 1), str(score), wrap_cell(status, 3),
+                             wrap_cell(comment, 4), wrap_cell(documents, 5)])
+
+            table = Table(data, colWidths=REPORT_COL_WIDTHS, repeatRows=1)
+            table.setStyle(REPORT_TABLE_STYLE)
+            yield table
+        yield Spacer(1, 0.2 * inch)
+
+
+def report_story_length(catalog):
+    # Number of flowables report_story yields, for progress reporting.
+    chunks = sum(-(-(end - start) // REPORT_CHUNK_ROWS) for start, end in catalog.chapter_ranges.values())
+    return 2 + 2 * len(catalog.chapters) + chunks
+
+
+class LazyStory(list):
+    # The story list handed to doc.build(), filled from an iterator as the
+    # build consumes it, so only the flowables of the page being laid out are
+    # ever in memory.  Keeps two buffered so a chapter heading can be kept
+    # with its first table.
+    def __init__(self, flowables):
+        super().__init__()
+        self._source = iter(flowables)
+        self.pulled = 0
+
+    def _fill(self):
+        while list.__len__(self) < 2:
+            flowable = next(self._source, None)
+            if flowable is None:
+                break
+            self.append(flowable)
+            self.pulled += 1
+
+    def __len__(self):
+        self._fill()
+        return list.__len__(self)
+
+    def __getitem__(self, index):
+        self._fill()
+        return list.__getitem__(self, index)
+
+    def handled(self):
+        return self.pulled - list.__len__(self)
+
+
+def build_report(path, audit_type, catalog, db_controls, on_progress=None):
+    # Landscape so the six columns fit inside the margins.
+    doc = SimpleDocTemplate(path, pagesize=landscape(letter),
+                            title=f"Reporte de Auditoría - {audit_type.upper()}")
+    story = LazyStory(report_story(audit_type, catalog, db_controls))
+    if on_progress:
+        total = report_story_length(catalog)
+
+        def progress(kind, value):
+            # reportlab measures progress against len(story), which here is
+            # only the buffer
+            if kind == 'SIZE_EST':
+                value = total
+            elif kind == 'PROGRESS':
+                value = story.handled()
+            on_progress(kind, value)
+        doc.setProgressCallBack(progress)
+
+    def page_footer(canvas, doc):
+        canvas.saveState()
+        canvas.setFont('Helvetica', 8)
+        canvas.drawString(doc.leftMargin, 0.5 * inch, f"{catalog.title} {catalog.version}".strip())
+        canvas.drawRightString(doc.pagesize[0] - doc.rightMargin, 0.5 * inch, f"Página {doc.page}")
+        canvas.restoreState()
+
+    with timed('report_build'):
+        doc.build(story, onFirstPage=page_footer, onLaterPages=page_footer)
+
+
+def report_key(audit_type, catalog, db_controls):
+    state = {
+        'framework': audit_type,
+        'version': catalog.version,
+        'template': REPORT_TEMPLATE_VERSION,
+        'controls': db_controls
+    }
+    # db_controls may be a read-only view from the store (mappingproxy)
+    payload = json.dumps(state, sort_keys=True, ensure_ascii=False, separators=(',', ':'), default=dict)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class ReportCache:
+    def __init__(self, folder=os.path.join(REPORTS_FOLDER, 'cache'), max_bytes=REPORT_CACHE_BYTES):
+        self.folder = os.path.abspath(folder)
+        self.max_bytes = max_bytes
+        os.makedirs(self.folder, exist_ok=True)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def path(self, key):
+        return os.path.join(self.folder, f'{key}.pdf')
+
+    def get(self, key):
+        # Path of the cached PDF, or None.  A hit refreshes the entry's mtime,
+        # which is what eviction orders by.
+        if not REPORT_KEY_RE.match(key):
+            return None
+        path = self.path(key)
+        try:
+            os.utime(path)
+        except OSError:
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return path
+
+    def put(self, key, src_path):
+        os.replace(src_path, self.path(key))
+        self.evict()
+        return self.path(key)
+
+    def evict(self):
+        entries = []
+        total = 0
+        for entry in os.scandir(self.folder):
+            if entry.is_file() and entry.name.endswith('.pdf'):
+                try:
+                    st = entry.stat()
+                except OSError:
+                    continue
+                entries.append((st.st_mtime, st.st_size, entry.path))
+                total += st.st_size
+        entries.sort()
+        # Always keep the newest entry, even when it alone is over the limit.
+        for mtime, size, path in entries[:-1]:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+
+    def stats(self):
+        files = [entry.stat().st_size for entry in os.scandir(self.folder)
+                 if entry.is_file() and entry.name.endswith('.pdf')]
+        return {'hits': self.hits, 'misses': self.misses, 'entries': len(files),
+                'bytes': sum(files), 'max_bytes': self.max_bytes}
+
+
+class ReportJobs:
+    def __init__(self, folder=REPORTS_FOLDER, slots=REPORT_SLOTS, cache=None):
+        self.folder = os.path.abspath(folder)
+        os.makedirs(folder, exist_ok=True)
+        self.cache = cache or ReportCache(os.path.join(folder, 'cache'))
+        self._executor = ThreadPoolExecutor(max_workers=slots, thread_name_prefix='report')
+        self._lock = threading.Lock()
+        self._jobs = {}
+
+    def _status_path(self, job_id):
+        return os.path.join(self.folder, f'{job_id}.json')
+
+    def _update(self, job, **fields):
+        with self._lock:
+            job.update(fields)
+            snapshot = dict(job)
+        tmp_path = self._status_path(job['id']) + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(snapshot, f)
+        os.replace(tmp_path, self._status_path(job['id']))
+
+    def submit(self, audit_type, catalog, db_controls, cache_key=None):
+        cache_key = cache_key or report_key(audit_type, catalog, db_controls)
+        with self._lock:
+            pending = [job for job in self._jobs.values() if job['status'] in ('queued', 'running')]
+        # The same audit state is already being rendered: share that job.
+        for job in pending:
+            if job['cache_key'] == cache_key:
+                return job['id']
+        if len(pending) >= MAX_QUEUED_JOBS:
+            raise QueueFull(f'{len(pending)} report jobs pending')
+        self.prune()
+        job_id = uuid.uuid4().hex
+        job = {
+            'id': job_id,
+            'audit_type': audit_type,
+            'cache_key': cache_key,
+            'status': 'queued',
+            'progress': 0.0,
+            'error': None,
+            'created': time.time(),
+            'finished': None
+        }
+        with self._lock:
+            self._jobs[job_id] = job
+        self._update(job)
+        self._executor.submit(self._run, job, catalog, db_controls)
+        return job_id
+
+    def close(self):
+        # Queued reports are still rendered
+        self._executor.shutdown(wait=True)
+
+    def _run(self, job, catalog, db_controls):
+        self._update(job, status='running', started=time.time())
+        total = [1]
+
+        def on_progress(kind, value):
+            if kind == 'SIZE_EST':
+                total[0] = max(value, 1)
+            elif kind == 'PROGRESS':
+                with self._lock:
+                    job['progress'] = round(min(value / total[0], 1.0), 3)
+
+        tmp_path = os.path.join(self.folder, f"{job['id']}.pdf.tmp")
+        try:
+            build_report(tmp_path, job['audit_type'], catalog, db_controls, on_progress)
+            self.cache.put(job['cache_key'], tmp_path)
+            self._update(job, status='done', progress=1.0, finished=time.time())
+        except Exception as e:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            self._update(job, status='failed', error=str(e), finished=time.time())
+
+    def get(self, job_id):
+        if not JOB_ID_RE.match(job_id):
+            return None
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None:
+                return dict(job)
+        # Submitted by another worker process.
+        try:
+            with open(self._status_path(job_id)) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def prune(self):
+        # Drop finished jobs older than JOB_TTL_SECONDS; their PDFs stay in the
+        # cache until evicted.
+        cutoff = time.time() - JOB_TTL_SECONDS
+        with self._lock:
+            expired = [job_id for job_id, job in self._jobs.items()
+                       if job['finished'] and job['finished'] < cutoff]
+            for job_id in expired:
+                del self._jobs[job_id]
+        for entry in os.scandir(self.folder):
+            if entry.is_file() and entry.stat().st_mtime < cutoff:
+                try:
+                    os.remove(entry.path)
+                except OSError:
+                    pass
@@ -0,0 +1,217 @@
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from markupsafe import escape, Markup
+
+try:
+    import pypdf
+except ImportError:  # no text extraction: documents are recorded as 'unavailable'
+    pypdf = None
+
+# Full-text search over the uploaded evidence.  Each PDF's text is extracted
+# page by page on a small background pool right after upload and written to an
+# SQLite FTS5 table (search.sqlite3), one row per page, so a search is a single
+# indexed MATCH ranked with bm25 (FTS5's default rank).  Documents are (re)indexed one at a time,
+# keyed by name and content hash; nothing is ever rebuilt wholesale.
+
+SEARCH_SLOTS = int(os.environ.get('SEARCH_SLOTS', 2))
+SNIPPET_TOKENS = 16
+SEARCH_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS pages USING fts5(
+    document UNINDEXED,
+    page UNINDEXED,
+    text,
+    tokenize = 'unicode61 remove_diacritics 2'
+);
+-- FTS5 cannot index the document column, so the rows of each document are
+-- looked up here when it is replaced instead of scanning the whole table
+CREATE TABLE IF NOT EXISTS page_rows (
+    document TEXT NOT NULL,
+    page_rowid INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_page_rows_document ON page_rows (document);
+CREATE TABLE IF NOT EXISTS indexed_documents (
+    document TEXT PRIMARY KEY,
+    sha256 TEXT,
+    status TEXT NOT NULL,
+    pages INTEGER,
+    error TEXT,
+    updated REAL
+);
+"""
+# Sentinels for snippet() highlights, swapped for <mark> after escaping
+MARK_START = '\x02'
+MARK_END = '\x03'
+
+
+def connect(path):
+    conn = sqlite3.connect(path, timeout=30, isolation_level=None)
+    conn.row_factory = sqlite3.Row
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.execute('PRAGMA synchronous=NORMAL')
+    return conn
+
+
+def extract_pages(path):
+    reader = pypdf.PdfReader(path)
+    for number, page in enumerate(reader.pages, 1):
+        yield number, page.extract_text() or ''
+
+
+def match_query(query):
+    # Every word must appear (implicit AND); quoting makes FTS5 operators and
+    # punctuation in user input literal.
+    terms = [term.replace('"', '""') for term in query.split()]
+    return ' '.join(f'"{term}"' for term in terms)
+
+
+class SearchIndex:
+    def __init__(self, path, slots=SEARCH_SLOTS, is_current=None):
+        self.path = path
+        # is_current(document, sha256): whether the document still exists with
+        # that content (sha256 None: at all); checked in the write transaction,
+        # so a job finishing after a delete or a newer upload writes nothing.
+        self.is_current = is_current
+        self._local = threading.local()
+        self._executor = ThreadPoolExecutor(max_workers=slots, thread_name_prefix='search')
+        self._lock = threading.Lock()
+        # (document, sha256) queued or running: new content is queued even
+        # while an older version of the document is still being indexed
+        self._pending = set()
+        # Called as listener(document, pages) after a document's text is stored
+        self.listeners = []
+        self._conn().executescript(SEARCH_SCHEMA)
+
+    def _conn(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._local.conn = connect(self.path)
+        return conn
+
+    def indexed_hash(self, document):
+        # Hash of the content last processed for this document; a file that
+        # could not be parsed is not retried until its content changes.
+        rows = self._conn().execute('SELECT sha256 FROM indexed_documents WHERE document = ? AND status != ?',
+                                    (document, 'unavailable')).fetchall()
+        return rows[0]['sha256'] if rows else None
+
+    def submit(self, document, path, sha256=None):
+        # Queues the document unless this exact content is already indexed.
+        if sha256 is not None and self.indexed_hash(document) == sha256:
+            return False
+        with self._lock:
+            if (document, sha256) in self._pending:
+                return False
+            self._pending.add((document, sha256))
+        self._executor.submit(self._run, document, path, sha256)
+        return True
+
+    def _run(self, document, path, sha256):
+        try:
+            self.index(document, path, sha256)
+        finally:
+            with self._lock:
+                self._pending.discard((document, sha256))
+
+    def close(self):
+        # Queued documents are still indexed
+        self._executor.shutdown(wait=True)
+
+    def _current(self, document, sha256):
+        return self.is_current is None or self.is_current(document, sha256)
+
+    def index(self, document, path, sha256=None):
+        if pypdf is None:
+            self._record(document, sha256, 'unavailable', None, 'pypdf is not installed')
+            return
+        try:
+            # Extract before taking the write lock; only the swap is transactional.
+            pages = list(extract_pages(path))
+        except Exception as e:
+            if self._current(document, sha256):
+                self._record(document, sha256, 'failed', None, str(e))
+            return
+        self.put_pages(document, sha256, pages)
+
+    def put_pages(self, document, sha256, pages):
+        # Replaces the document's rows with [(page number, text), ...] in one
+        # transaction; False if the document was deleted or replaced meanwhile.
+        conn = self._conn()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            if not self._current(document, sha256):
+                conn.execute('ROLLBACK')
+                return False
+            self._delete_pages(conn, document)
+            for number, text in pages:
+                if text.strip():
+                    rowid = conn.execute('INSERT INTO pages (document, page, text) VALUES (?, ?, ?)',
+                                         (document, number, text)).lastrowid
+                    conn.execute('INSERT INTO page_rows (document, page_rowid) VALUES (?, ?)', (document, rowid))
+            self._record(document, sha256, 'indexed', len(pages), None, conn)
+            conn.execute('COMMIT')
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+        for listener in self.listeners:
+            listener(document, pages)
+        return True
+
+    def remove(self, document):
+        # Drops a deleted document; listeners get it with no pages.
+        conn = self._conn()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            self._delete_pages(conn, document)
+            conn.execute('DELETE FROM indexed_documents WHERE document = ?', (document,))
+            conn.execute('COMMIT')
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+        for listener in self.listeners:
+            listener(document, [])
+
+    @staticmethod
+    def _delete_pages(conn, document):
+        conn.execute('DELETE FROM pages WHERE rowid IN (SELECT page_rowid FROM page_rows WHERE document = ?)',
+                     (document,))
+        conn.execute('DELETE FROM page_rows WHERE document = ?', (document,))
+
+    def document_texts(self):
+        # (document, full text) for every indexed document
+        rows = self._conn().execute("SELECT document, group_concat(text, ' ') AS text FROM pages GROUP BY document")
+        for row in rows:
+            yield row['document'], row['text']
+
+    def _record(self, document, sha256, status, pages, error, conn=None):
+        (conn or self._conn()).execute(
+            'INSERT OR REPLACE INTO indexed_documents (document, sha256, status, pages, error, updated) '
+            'VALUES (?, ?, ?, ?, ?, ?)', (document, sha256, status, pages, error, time.time()))
+
+    def search(self, query, limit=20, offset=0):
+        # Best-ranked pages first: [{'document', 'page', 'snippet', 'score'}];
+        # snippets are escaped HTML with the matches in <mark>.
+        match = match_query(query)
+        if not match:
+            return []
+        rows = self._conn().execute(
+            'SELECT document, page, snippet(pages, 2, ?, ?, ?, ?) AS snippet, rank AS score '
+            'FROM pages WHERE pages MATCH ? ORDER BY rank LIMIT ? OFFSET ?',
+            (MARK_START, MARK_END, '…', SNIPPET_TOKENS, match, limit, offset)).fetchall()
+        return [{
+            'document': row['document'],
+            'page': row['page'],
+            'snippet': Markup(str(escape(row['snippet'])).replace(MARK_START, '<mark>').replace(MARK_END, '</mark>')),
+            'score': round(-row['score'], 6)
+        } for row in rows]
+
+    def stats(self):
+        conn = self._conn()
+        counts = {row['status']: row['count'] for row in conn.execute(
+            'SELECT status, COUNT(*) AS count FROM indexed_documents GROUP BY status')}
+        with self._lock:
+            counts['pending'] = len(self._pending)
+        return counts
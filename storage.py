@@ -0,0 +1,951 @@
+import copy
+import json
+import logging
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from types import MappingProxyType
+
+from metrics import timed
+
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process locking, single worker only
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+# Storage engine for the audit database.
+#
+# database.json is kept as a snapshot and every save() appends only the
+# changed keys to database.json.log, one JSON line per commit.  On startup the
+# snapshot is loaded and the log replayed on top of it.  Once the log grows past
+# COMPACT_LOG_BYTES it is folded back into a new snapshot by a background thread.
+#
+# The parsed state stays in memory.  Every access stats the snapshot and log;
+# a changed inode or mtime means another worker compacted and the state is
+# re-read, a longer log means another worker committed and only the new tail
+# is replayed.  Read-only pages use view(), which hands out frozen copies that
+# are rebuilt per top-level key only when that key changes.
+#
+# Commits take an exclusive flock on database.json.lock only for the append, so
+# the log is the single ordering point between workers.  transaction() is
+# optimistic: it works on a private copy and at commit time only fails if one
+# of the keys it changed was also changed by someone else in the meantime.
+# Writes to disjoint controls (and appends to 'documents') merge cleanly.
+#
+# Both stores publish a change feed: every listener is called as
+# listener(framework, control_id, old_record, new_record) for each control
+# written, including commits replayed from other workers.  control_id None
+# means the framework's controls were replaced wholesale, framework None that
+# everything may have changed (after a reload); listeners then start over.
+# Listeners are called once the commit is complete but while the store's locks
+# are still held, so they must only record the change and return; anything
+# that takes another lock or reads the store is done later (see documents.py).
+
+COMPACT_LOG_BYTES = 1024 * 1024
+SEQ_KEY = '_wal_seq'
+TRANSACTION_RETRIES = 10
+FRAMEWORK_COLLECTIONS = {
+    'iso': 'controls',
+    'ecuador': 'ecuador_controls'
+}
+
+
+class TransactionConflict(Exception):
+    pass
+
+
+def collection_for(framework):
+    # Database key holding the evaluated controls of a framework.
+    return FRAMEWORK_COLLECTIONS.get(framework, f'{framework}_controls')
+
+
+def framework_for(collection):
+    for framework, name in FRAMEWORK_COLLECTIONS.items():
+        if name == collection:
+            return framework
+    if collection.endswith('_controls'):
+        return collection[:-len('_controls')]
+    return None
+
+
+def empty_db():
+    return {
+        'controls': {},
+        'documents': [],
+        'audits': {}
+    }
+
+
+def write_temp(path, data):
+    tmp_path = f"{path}.tmp.{os.getpid()}.{threading.get_ident()}"
+    with open(tmp_path, 'w') as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    return tmp_path
+
+
+def atomic_write(path, data):
+    # Write to a temp file, fsync it and rename it over the target so readers
+    # see either the old or the new file, never a torn one.
+    os.replace(write_temp(path, data), path)
+    fsync_dir(path)
+
+
+def fsync_dir(path):
+    try:
+        fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def diff_db(old, new):
+    # Ops are [op, path, value]; the path is the top-level key, optionally
+    # followed by a key inside a dict collection such as 'controls'.
+    ops = []
+    for key, value in new.items():
+        if key not in old:
+            ops.append(['set', [key], value])
+            continue
+        current = old[key]
+        if current == value:
+            continue
+        if isinstance(current, dict) and isinstance(value, dict):
+            for sub_key, sub_value in value.items():
+                if sub_key not in current or current[sub_key] != sub_value:
+                    ops.append(['set', [key, sub_key], sub_value])
+            for sub_key in current:
+                if sub_key not in value:
+                    ops.append(['del', [key, sub_key], None])
+        elif (isinstance(current, list) and isinstance(value, list)
+              and len(value) > len(current) and value[:len(current)] == current):
+            ops.append(['extend', [key], value[len(current):]])
+        else:
+            ops.append(['set', [key], value])
+    for key in old:
+        if key not in new:
+            ops.append(['del', [key], None])
+    return ops
+
+
+def clone(value):
+    # Deep copy for plain JSON data; several times faster than copy.deepcopy.
+    return pickle.loads(pickle.dumps(value, pickle.HIGHEST_PROTOCOL))
+
+
+def freeze(value):
+    if isinstance(value, dict):
+        return MappingProxyType({k: freeze(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return tuple(freeze(v) for v in value)
+    return value
+
+
+def file_signature(path):
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+
+def apply_op(db, op):
+    action, path, value = op
+    target = db
+    for key in path[:-1]:
+        target = target.setdefault(key, {})
+    key = path[-1]
+    if action == 'set':
+        target[key] = value
+    elif action == 'del':
+        target.pop(key, None)
+    elif action == 'extend':
+        target.setdefault(key, []).extend(value)
+    elif action == 'remove':
+        target[key] = [item for item in target.get(key, []) if item not in value]
+    else:
+        raise ValueError(f'Unknown log operation: {action}')
+
+
+class LogStore:
+    def __init__(self, path, compact_bytes=COMPACT_LOG_BYTES):
+        self.path = path
+        self.log_path = path + '.log'
+        self.lock_path = path + '.lock'
+        self.compact_bytes = compact_bytes
+        self._lock = threading.RLock()
+        self._compacting = False
+        self._hits = 0
+        self._misses = 0
+        self._tail_replays = 0
+        self._conflicts = 0
+        self._flock_depth = 0
+        self.listeners = []
+        self._recover()
+
+    @contextmanager
+    def _file_lock(self, exclusive=True):
+        with self._lock:
+            if fcntl is None or self._flock_depth:
+                # flock is per open file, so re-locking from the same thread would deadlock.
+                yield
+                return
+            with open(self.lock_path, 'a') as f:
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+                self._flock_depth += 1
+                try:
+                    yield
+                finally:
+                    self._flock_depth -= 1
+                    fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+    def _recover(self):
+        # Shared lock so a compaction can't swap the snapshot and log between our two reads.
+        with timed('storage_load'), self._file_lock(exclusive=False):
+            snapshot_sig = file_signature(self.path)
+            log_sig = file_signature(self.log_path)
+            state = empty_db()
+            if snapshot_sig is not None:
+                with open(self.path, 'r') as f:
+                    state = json.load(f)
+            seq = state.pop(SEQ_KEY, 0)
+            self._state = state
+            self._seq = seq
+            # Which commit last touched each key; anything at or below the
+            # snapshot seq is unknown, so transactions older than it conflict.
+            self._key_seqs = {}
+            self._floor_seq = seq
+            # Top-level values referenced by an open transaction's base; they are
+            # copied before their next change instead of being mutated in place.
+            self._shared = set()
+            self._log_bytes = 0
+            self._frozen = {}
+            self._view = None
+            self._snapshot_sig = snapshot_sig
+            self._log_ino = log_sig[0] if log_sig else None
+            if log_sig is not None:
+                self._replay_log()
+        self._notify(None, None, None, None)
+
+    def _replay_log(self):
+        with open(self.log_path, 'rb') as f:
+            if os.fstat(f.fileno()).st_ino != self._log_ino:
+                return False
+            f.seek(self._log_bytes)
+            changes = []
+            for line in f:
+                if not line.endswith(b'\n'):
+                    # Torn or still being written; the next commit truncates it.
+                    break
+                self._log_bytes += len(line)
+                try:
+                    record = json.loads(line)
+                    seq = record['seq']
+                except (ValueError, KeyError, TypeError):
+                    # Complete but unreadable: skipped, like every other worker does.
+                    logger.warning('Skipping corrupt record at byte %d of %s', self._log_bytes - len(line),
+                                   self.log_path)
+                    continue
+                if seq <= self._seq:
+                    continue
+                changes += self._apply(record['ops'], seq)
+                self._seq = seq
+        # Only now that _seq and _log_bytes are current: a listener reading the
+        # store must not replay these lines again.
+        self._notify_changes(changes)
+        return True
+
+    def _refresh(self):
+        # Pick up commits and compactions made by other processes.
+        log_sig = file_signature(self.log_path)
+        log_ino = log_sig[0] if log_sig else None
+        if file_signature(self.path) != self._snapshot_sig or log_ino != self._log_ino:
+            self._misses += 1
+            self._recover()
+        elif log_sig is not None and log_sig[2] > self._log_bytes:
+            self._tail_replays += 1
+            if not self._replay_log():
+                self._misses += 1
+                self._recover()
+        else:
+            self._hits += 1
+
+    def _apply(self, ops, seq):
+        # Returns the control changes for the feed; the caller delivers them
+        # once its commit or replay is complete.
+        changes = []
+        for op in ops:
+            key = op[1][0]
+            framework = framework_for(key) if self.listeners else None
+            if framework is not None:
+                if len(op[1]) == 2:
+                    old = self._state.get(key, {}).get(op[1][1])
+                    changes.append((framework, op[1][1], old, op[2] if op[0] == 'set' else None))
+                else:
+                    changes.append((framework, None, None, None))
+            if key in self._shared:
+                self._shared.discard(key)
+                if isinstance(self._state.get(key), (dict, list)):
+                    self._state[key] = copy.copy(self._state[key])
+            apply_op(self._state, op)
+            self._frozen.pop(key, None)
+            if op[0] != 'extend':
+                self._key_seqs[tuple(op[1])] = seq
+            self._key_seqs[(key, '*')] = seq
+        self._view = None
+        return changes
+
+    def _notify(self, framework, control_id, old, new):
+        for listener in self.listeners:
+            listener(framework, control_id, old, new)
+
+    def _notify_changes(self, changes):
+        for change in changes:
+            self._notify(*change)
+
+    def sync(self):
+        # Replays other workers' commits now, so listeners see them.
+        with self._lock:
+            self._refresh()
+
+    def _changed_since(self, path, base_seq):
+        if base_seq < self._floor_seq:
+            return True
+        seqs = self._key_seqs
+        if len(path) == 1:
+            # Any change below the key, including appends.
+            return seqs.get((path[0], '*'), 0) > base_seq
+        return seqs.get(tuple(path), 0) > base_seq or seqs.get((path[0],), 0) > base_seq
+
+    def load(self):
+        # Mutable deep copy for callers that will hand it back to save().
+        with self._lock:
+            self._refresh()
+            return clone(self._state)
+
+    def view(self):
+        # Read-only view shared between requests; rebuilt only for changed keys.
+        with self._lock:
+            self._refresh()
+            if self._view is None:
+                for key, value in self._state.items():
+                    if key not in self._frozen:
+                        self._frozen[key] = freeze(value)
+                self._view = MappingProxyType(dict(self._frozen))
+            return self._view
+
+    def stats(self):
+        with self._lock:
+            return {
+                'backend': 'json',
+                'hits': self._hits,
+                'misses': self._misses,
+                'tail_replays': self._tail_replays,
+                'conflicts': self._conflicts,
+                'seq': self._seq,
+                'log_bytes': self._log_bytes
+            }
+
+    def disk_bytes(self):
+        return sum(os.path.getsize(path) for path in (self.path, self.log_path) if os.path.exists(path))
+
+    def save(self, db):
+        # Last writer wins per key; use transaction() when that matters.
+        with self._file_lock():
+            self._refresh()
+            ops = diff_db(self._state, db)
+            if ops:
+                self._commit(clone(ops))
+        self._maybe_compact()
+
+    @contextmanager
+    def transaction(self):
+        with self._lock:
+            self._refresh()
+            base_seq = self._seq
+            base = dict(self._state)
+            self._shared.update(base)
+        db = clone(base)
+        yield db
+        ops = diff_db(base, db)
+        if not ops:
+            return
+        with self._file_lock():
+            self._refresh()
+            for op in ops:
+                if op[0] == 'extend':
+                    # Appends commute with other appends, only a replaced list conflicts.
+                    conflict = base_seq < self._floor_seq or self._key_seqs.get(tuple(op[1]), 0) > base_seq
+                else:
+                    conflict = self._changed_since(op[1], base_seq)
+                if conflict:
+                    self._conflicts += 1
+                    raise TransactionConflict(f"{'/'.join(op[1])} changed concurrently")
+            self._commit(clone(ops))
+        self._maybe_compact()
+
+    def update(self, fn, retries=TRANSACTION_RETRIES):
+        # Run fn(db) in a transaction, re-running it on conflicts.
+        for attempt in range(retries):
+            try:
+                with self.transaction() as db:
+                    return fn(db)
+            except TransactionConflict:
+                if attempt == retries - 1:
+                    raise
+
+    # Record-level API shared with SqliteStore.  Single-record writes are done
+    # read-modify-write under the file lock, so they never conflict or retry.
+
+    def documents(self):
+        return self.view().get('documents', ())
+
+    def controls(self, framework, status=None, mapped_only=False, ids=None):
+        # ids limits the result to those controls (e.g. one chapter)
+        controls = self.view().get(collection_for(framework), {})
+        if ids is not None:
+            controls = {control_id: controls[control_id] for control_id in ids if control_id in controls}
+        if status is None and not mapped_only:
+            return controls
+        return {
+            control_id: data for control_id, data in controls.items()
+            if (status is None or data.get('status') == status)
+            and (not mapped_only or data.get('documents'))
+        }
+
+    def get_control(self, framework, control_id):
+        return self.controls(framework).get(control_id)
+
+    def revision(self):
+        # (commit number, time of the last commit); validators for HTTP caching
+        with self._lock:
+            self._refresh()
+            signatures = [sig for sig in (self._snapshot_sig, file_signature(self.log_path)) if sig]
+            return self._seq, max((sig[1] for sig in signatures), default=0) / 1e9
+
+    def documents_page(self, after=0, limit=100):
+        # [(position, name, file info or None)] for positions after `after` (1-based)
+        view = self.view()
+        files = view.get('document_files', {})
+        names = view.get('documents', ())[after:after + limit]
+        return [(after + i, name, files.get(name)) for i, name in enumerate(names, 1)]
+
+    def add_documents(self, names):
+        self._write([['extend', ['documents'], list(names)]])
+
+    def document_info(self, name):
+        return self.view().get('document_files', {}).get(name)
+
+    def find_document(self, sha256):
+        for name, info in self.view().get('document_files', {}).items():
+            if info.get('sha256') == sha256:
+                return name
+        return None
+
+    def add_document_files(self, files):
+        # Records {name: metadata} for uploaded files in one commit; each name
+        # is listed only once.  Returns {name: old metadata} of the names that
+        # already had a file, read under the same lock as the write.
+        replaced = {}
+
+        def ops():
+            listed = set(self._state.get('documents', []))
+            current = self._state.get('document_files', {})
+            replaced.update((name, clone(current[name])) for name in files if name in current)
+            ops = [['set', ['document_files', name], clone(info)] for name, info in files.items()]
+            new_names = [name for name in files if name not in listed]
+            if new_names:
+                ops.append(['extend', ['documents'], new_names])
+            return ops
+        self._write(ops)
+        return replaced
+
+    def remove_document(self, name):
+        # Unlists the document and drops its file metadata; False if it was not listed
+        removed = []
+
+        def ops():
+            if name not in self._state.get('documents', []):
+                return []
+            removed.append(name)
+            return [['remove', ['documents'], [name]], ['del', ['document_files', name], None]]
+        self._write(ops)
+        return bool(removed)
+
+    # put_control() and update_control() return the record as it was before
+    # (None if there was none), read under the same lock as the write.
+
+    def put_control(self, framework, control_id, record):
+        collection = collection_for(framework)
+        old = []
+
+        def replace():
+            old.append(self._state.get(collection, {}).get(control_id))
+            return [['set', [collection, control_id], clone(record)]]
+        self._write(replace)
+        return clone(old[0])
+
+    def update_control(self, framework, control_id, fields):
+        collection = collection_for(framework)
+        old = []
+
+        def merge():
+            old.append(self._state.get(collection, {}).get(control_id))
+            record = dict(old[0] or {})
+            record.update(clone(fields))
+            return [['set', [collection, control_id], record]]
+        self._write(merge)
+        return clone(old[0])
+
+    def _write(self, ops):
+        with self._file_lock():
+            self._refresh()
+            self._commit(ops() if callable(ops) else ops)
+        self._maybe_compact()
+
+    def _commit(self, ops):
+        # Caller holds the exclusive file lock and has just refreshed.
+        seq = self._seq + 1
+        line = json.dumps({'seq': seq, 'ops': ops}) + '\n'
+        with timed('storage_save'), open(self.log_path, 'a') as f:
+            if f.seek(0, os.SEEK_END) > self._log_bytes:
+                # Torn tail left by a crashed writer.
+                f.truncate(self._log_bytes)
+            f.write(line)
+            f.flush()
+            os.fsync(f.fileno())
+            if self._log_ino is None:
+                self._log_ino = os.fstat(f.fileno()).st_ino
+        self._seq = seq
+        self._log_bytes += len(line.encode())
+        self._notify_changes(self._apply(ops, seq))
+
+    def _maybe_compact(self):
+        with self._lock:
+            if self._compacting or self._log_bytes < self.compact_bytes:
+                return
+            self._compacting = True
+        threading.Thread(target=self.compact, daemon=True).start()
+
+    def compact(self):
+        try:
+            with self._lock:
+                self._refresh()
+                snapshot = dict(self._state)
+                snapshot[SEQ_KEY] = self._seq
+                with timed('storage_compact'):
+                    data = json.dumps(snapshot, indent=4)
+                seq = self._seq
+                snapshot_sig = self._snapshot_sig
+            with timed('storage_compact'):
+                tmp_path = write_temp(self.path, data)
+            with self._file_lock():
+                self._refresh()
+                if self._snapshot_sig != snapshot_sig:
+                    # Another worker compacted first.
+                    os.unlink(tmp_path)
+                    return
+                os.replace(tmp_path, self.path)
+                fsync_dir(self.path)
+                self._truncate_log(seq)
+                self._snapshot_sig = file_signature(self.path)
+                self._log_ino = file_signature(self.log_path)[0]
+        finally:
+            self._compacting = False
+
+    def _truncate_log(self, snapshot_seq):
+        # Keep only commits that landed after the snapshot was taken.
+        kept = []
+        if os.path.exists(self.log_path):
+            with open(self.log_path, 'rb') as f:
+                for line in f:
+                    if not line.endswith(b'\n'):
+                        continue
+                    try:
+                        seq = json.loads(line)['seq']
+                    except (ValueError, KeyError, TypeError):
+                        # Corrupt record: already skipped by every replay, dropped here.
+                        continue
+                    if seq > snapshot_seq:
+                        kept.append(line.decode())
+        data = ''.join(kept)
+        atomic_write(self.log_path, data)
+        self._log_bytes = len(data.encode())
+
+
+# SQLite backend.  Controls and documents live in indexed tables so pages can
+# ask for "controls of framework X with status Y" without loading everything;
+# any other top-level keys of the JSON database are kept as JSON in `meta`.
+
+CONTROL_COLUMNS = ('title', 'status', 'score', 'comment')
+DOCUMENT_FILE_COLUMNS = ('sha256', 'size', 'pages', 'uploaded')
+
+SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS controls (
+    framework TEXT NOT NULL,
+    control_id TEXT NOT NULL,
+    title TEXT,
+    status TEXT,
+    score INTEGER,
+    comment TEXT,
+    documents TEXT,
+    extra TEXT,
+    PRIMARY KEY (framework, control_id)
+);
+CREATE INDEX IF NOT EXISTS idx_controls_status ON controls (framework, status);
+CREATE INDEX IF NOT EXISTS idx_controls_score ON controls (framework, score);
+CREATE TABLE IF NOT EXISTS control_documents (
+    framework TEXT NOT NULL,
+    control_id TEXT NOT NULL,
+    document TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_control_documents_control ON control_documents (framework, control_id);
+CREATE INDEX IF NOT EXISTS idx_control_documents_document ON control_documents (document);
+CREATE TABLE IF NOT EXISTS documents (
+    position INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_documents_name ON documents (name);
+CREATE TABLE IF NOT EXISTS document_files (
+    name TEXT PRIMARY KEY,
+    sha256 TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    pages INTEGER,
+    uploaded REAL
+);
+CREATE INDEX IF NOT EXISTS idx_document_files_sha256 ON document_files (sha256);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+-- Bumped by every commit that writes controls; a jump larger than this
+-- worker's own commits means another worker wrote in between
+CREATE TABLE IF NOT EXISTS control_revision (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    revision INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO control_revision (id, revision) VALUES (1, 0);
+-- Bumped by every commit that changed anything
+CREATE TABLE IF NOT EXISTS db_revision (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    revision INTEGER NOT NULL,
+    modified REAL
+);
+INSERT OR IGNORE INTO db_revision (id, revision, modified) VALUES (1, 0, NULL);
+"""
+
+
+class SqliteStore:
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        self._queries = 0
+        self._lock = threading.Lock()
+        self.listeners = []
+        self._conn().executescript(SQLITE_SCHEMA)
+        self._revision = self._read_revision(self._conn())
+
+    def _conn(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def _begin(self):
+        return _SqliteTransaction(self)
+
+    @staticmethod
+    def _read_revision(conn):
+        return conn.execute('SELECT revision FROM control_revision').fetchone()[0]
+
+    def _changes(self):
+        # Control changes of the transaction open on this thread.
+        return self._local.changes
+
+    def _notify(self, changes):
+        for change in changes:
+            for listener in self.listeners:
+                listener(*change)
+
+    def sync(self):
+        # Commits from other workers are not seen change by change; if any
+        # happened, listeners are told to start over.
+        revision = self._read_revision(self._conn())
+        with self._lock:
+            if revision == self._revision:
+                return
+            self._revision = revision
+        self._notify([(None, None, None, None)])
+
+    def _query(self, sql, params=()):
+        self._queries += 1
+        return self._conn().execute(sql, params).fetchall()
+
+    @staticmethod
+    def _record(row):
+        record = json.loads(row['extra']) if row['extra'] else {}
+        for column in CONTROL_COLUMNS:
+            if row[column] is not None:
+                record[column] = row[column]
+        if row['documents'] is not None:
+            record['documents'] = json.loads(row['documents'])
+        return record
+
+    def documents(self):
+        return [row['name'] for row in self._query('SELECT name FROM documents ORDER BY position')]
+
+    def controls(self, framework, status=None, mapped_only=False, ids=None):
+        sql = 'SELECT * FROM controls WHERE framework = ?'
+        params = [framework]
+        if ids is not None:
+            sql += ' AND control_id IN (SELECT value FROM json_each(?))'
+            params.append(json.dumps(list(ids)))
+        if status is not None:
+            sql += ' AND status = ?'
+            params.append(status)
+        if mapped_only:
+            sql += ' AND EXISTS (SELECT 1 FROM control_documents d WHERE d.framework = controls.framework AND d.control_id = controls.control_id)'
+        sql += ' ORDER BY rowid'
+        return {row['control_id']: self._record(row) for row in self._query(sql, params)}
+
+    def get_control(self, framework, control_id):
+        rows = self._query('SELECT * FROM controls WHERE framework = ? AND control_id = ?', (framework, control_id))
+        return self._record(rows[0]) if rows else None
+
+    def revision(self):
+        rows = self._query('SELECT revision, modified FROM db_revision')
+        return rows[0]['revision'], rows[0]['modified'] or 0
+
+    def documents_page(self, after=0, limit=100):
+        rows = self._query('SELECT d.position, d.name, f.sha256, f.size, f.pages, f.uploaded FROM documents d '
+                           'LEFT JOIN document_files f ON f.name = d.name WHERE d.position > ? '
+                           'ORDER BY d.position LIMIT ?', (after, limit))
+        return [(row['position'], row['name'],
+                 {column: row[column] for column in DOCUMENT_FILE_COLUMNS} if row['sha256'] is not None else None)
+                for row in rows]
+
+    def add_documents(self, names):
+        with self._begin() as conn:
+            conn.executemany('INSERT INTO documents (name) VALUES (?)', [(name,) for name in names])
+
+    def document_info(self, name):
+        rows = self._query('SELECT * FROM document_files WHERE name = ?', (name,))
+        return {column: rows[0][column] for column in DOCUMENT_FILE_COLUMNS} if rows else None
+
+    def find_document(self, sha256):
+        rows = self._query('SELECT name FROM document_files WHERE sha256 = ? LIMIT 1', (sha256,))
+        return rows[0]['name'] if rows else None
+
+    def add_document_files(self, files):
+        replaced = {}
+        with self._begin() as conn:
+            for name, info in files.items():
+                row = conn.execute('SELECT * FROM document_files WHERE name = ?', (name,)).fetchone()
+                if row is not None:
+                    replaced[name] = {column: row[column] for column in DOCUMENT_FILE_COLUMNS}
+                self._put_document_file(conn, name, info)
+                if not conn.execute('SELECT 1 FROM documents WHERE name = ?', (name,)).fetchall():
+                    conn.execute('INSERT INTO documents (name) VALUES (?)', (name,))
+        return replaced
+
+    def remove_document(self, name):
+        with self._begin() as conn:
+            removed = conn.execute('DELETE FROM documents WHERE name = ?', (name,)).rowcount
+            conn.execute('DELETE FROM document_files WHERE name = ?', (name,))
+        return removed > 0
+
+    def put_control(self, framework, control_id, record):
+        with self._begin() as conn:
+            old = self._get(conn, framework, control_id)
+            self._put(conn, framework, control_id, record)
+        return old
+
+    def update_control(self, framework, control_id, fields):
+        with self._begin() as conn:
+            old = self._get(conn, framework, control_id)
+            record = dict(old or {}, **fields)
+            self._put(conn, framework, control_id, record)
+        return old
+
+    def _get(self, conn, framework, control_id):
+        rows = conn.execute('SELECT * FROM controls WHERE framework = ? AND control_id = ?', (framework, control_id)).fetchall()
+        return self._record(rows[0]) if rows else None
+
+    def _put(self, conn, framework, control_id, record):
+        self._changes().append((framework, control_id, self._get(conn, framework, control_id), clone(record)))
+        extra = {k: v for k, v in record.items() if k not in CONTROL_COLUMNS and k != 'documents'}
+        documents = record.get('documents')
+        conn.execute(
+            'INSERT INTO controls (framework, control_id, title, status, score, comment, documents, extra) '
+            'VALUES (?, ?, ?, ?, ?, ?, ?, ?) '
+            'ON CONFLICT (framework, control_id) DO UPDATE SET title = excluded.title, status = excluded.status, '
+            'score = excluded.score, comment = excluded.comment, documents = excluded.documents, extra = excluded.extra',
+            (framework, control_id, *(record.get(column) for column in CONTROL_COLUMNS),
+             json.dumps(documents) if documents is not None else None,
+             json.dumps(extra) if extra else None))
+        conn.execute('DELETE FROM control_documents WHERE framework = ? AND control_id = ?', (framework, control_id))
+        conn.executemany('INSERT INTO control_documents (framework, control_id, document) VALUES (?, ?, ?)',
+                         [(framework, control_id, document) for document in documents or []])
+
+    def _put_document_file(self, conn, name, info):
+        conn.execute('INSERT OR REPLACE INTO document_files (name, sha256, size, pages, uploaded) VALUES (?, ?, ?, ?, ?)',
+                     (name, *(info.get(column) for column in DOCUMENT_FILE_COLUMNS)))
+
+    def _delete(self, conn, framework, control_id):
+        self._changes().append((framework, control_id, self._get(conn, framework, control_id), None))
+        conn.execute('DELETE FROM controls WHERE framework = ? AND control_id = ?', (framework, control_id))
+        conn.execute('DELETE FROM control_documents WHERE framework = ? AND control_id = ?', (framework, control_id))
+
+    # Whole-database API, for compatibility with the JSON store.
+
+    def _load(self, conn):
+        with timed('storage_load'):
+            db = empty_db()
+            for row in conn.execute('SELECT key, value FROM meta'):
+                db[row['key']] = json.loads(row['value'])
+            for row in conn.execute('SELECT * FROM controls ORDER BY rowid'):
+                db.setdefault(collection_for(row['framework']), {})[row['control_id']] = self._record(row)
+            db['documents'] = [row['name'] for row in conn.execute('SELECT name FROM documents ORDER BY position')]
+            document_files = {row['name']: {column: row[column] for column in DOCUMENT_FILE_COLUMNS}
+                              for row in conn.execute('SELECT * FROM document_files ORDER BY name')}
+            if document_files:
+                db['document_files'] = document_files
+            return db
+
+    def load(self):
+        return self._load(self._conn())
+
+    def view(self):
+        return freeze(self.load())
+
+    def save(self, db):
+        with self.transaction() as current:
+            current.clear()
+            current.update(clone(db))
+
+    @contextmanager
+    def transaction(self):
+        # BEGIN IMMEDIATE takes SQLite's write lock up front, so there is nothing to retry.
+        with self._begin() as conn:
+            base = self._load(conn)
+            db = clone(base)
+            yield db
+            for action, path, value in diff_db(base, db):
+                self._apply(conn, action, path, value)
+
+    def update(self, fn, retries=TRANSACTION_RETRIES):
+        with self.transaction() as db:
+            return fn(db)
+
+    def _apply(self, conn, action, path, value):
+        key = path[0]
+        framework = framework_for(key)
+        if key == 'documents':
+            if action != 'extend':
+                conn.execute('DELETE FROM documents')
+            conn.executemany('INSERT INTO documents (name) VALUES (?)', [(name,) for name in value or []])
+        elif key == 'document_files':
+            if len(path) == 2:
+                conn.execute('DELETE FROM document_files WHERE name = ?', (path[1],))
+                if action == 'set':
+                    self._put_document_file(conn, path[1], value)
+            else:
+                conn.execute('DELETE FROM document_files')
+                for name, info in (value or {}).items() if action == 'set' else ():
+                    self._put_document_file(conn, name, info)
+        elif framework is not None and len(path) == 2:
+            if action == 'set':
+                self._put(conn, framework, path[1], value)
+            else:
+                self._delete(conn, framework, path[1])
+        elif framework is not None:
+            conn.execute('DELETE FROM controls WHERE framework = ?', (framework,))
+            conn.execute('DELETE FROM control_documents WHERE framework = ?', (framework,))
+            for control_id, record in (value or {}).items() if action == 'set' else ():
+                self._put(conn, framework, control_id, record)
+            self._changes()[:] = [change for change in self._changes() if change[0] != framework]
+            self._changes().append((framework, None, None, None))
+        elif action == 'del':
+            conn.execute('DELETE FROM meta WHERE key = ?', (key,))
+        else:
+            # Sub-key changes of other top-level values rewrite the whole value.
+            rows = conn.execute('SELECT value FROM meta WHERE key = ?', (key,)).fetchall()
+            current = json.loads(rows[0]['value']) if rows else {}
+            if len(path) == 2:
+                current[path[1]] = value
+            else:
+                current = value
+            conn.execute('INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)', (key, json.dumps(current)))
+
+    def disk_bytes(self):
+        return sum(os.path.getsize(path) for path in (self.path, self.path + '-wal') if os.path.exists(path))
+
+    def stats(self):
+        conn = self._conn()
+        return {
+            'backend': 'sqlite',
+            'queries': self._queries,
+            'data_version': conn.execute('PRAGMA data_version').fetchone()[0],
+            'controls': conn.execute('SELECT COUNT(*) FROM controls').fetchone()[0],
+            'documents': conn.execute('SELECT COUNT(*) FROM documents').fetchone()[0]
+        }
+
+
+class _SqliteTransaction:
+    # `with store._begin() as conn:` runs the block in BEGIN IMMEDIATE ... COMMIT
+    # and publishes the control changes it made once they are committed.
+    def __init__(self, store):
+        self.store = store
+        self.conn = store._conn()
+
+    def __enter__(self):
+        self.conn.execute('BEGIN IMMEDIATE')
+        self.store._local.changes = []
+        self.total_changes = self.conn.total_changes
+        return self.conn
+
+    def __exit__(self, exc_type, exc, tb):
+        changes = self.store._local.changes
+        self.store._local.changes = None
+        if exc_type:
+            self.conn.execute('ROLLBACK')
+            return False
+        if self.conn.total_changes != self.total_changes:
+            self.conn.execute('UPDATE db_revision SET revision = revision + 1, modified = ?', (time.time(),))
+        if changes:
+            # Still holding the write lock, so the revision read here is current.
+            revision = self.store._read_revision(self.conn) + 1
+            self.conn.execute('UPDATE control_revision SET revision = ?', (revision,))
+        with timed('storage_save'):
+            self.conn.execute('COMMIT')
+        if changes:
+            with self.store._lock:
+                if revision != self.store._revision + 1:
+                    # Missed another worker's commit: start over instead.
+                    changes = [(None, None, None, None)]
+                self.store._revision = revision
+            self.store._notify(changes)
+        return False
+
+
+def open_store(backend, path):
+    if backend == 'sqlite':
+        return SqliteStore(path)
+    if backend == 'json':
+        return LogStore(path)
+    raise ValueError(f'Unknown storage backend: {backend}')
@@ -0,0 +1,274 @@
+import json
+import re
+import threading
+import unicodedata
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from search import connect
+
+# Control -> document suggestions for the mapping pages.
+#
+# Every framework's controls (chapter, control and subcontrol titles, and the
+# article text for laws) are turned into TF-IDF vectors once per framework
+# version and kept in memory as one L2-normalized matrix.  When the search
+# index finishes extracting an upload, its text is vectorized against each
+# framework's vocabulary and scored against every control with a single
+# matrix-vector product; the best SUGGESTIONS_PER_CONTROL documents per control
+# are stored in search.sqlite3, so the mapping page only reads a few rows.
+# A framework used for the first time (or whose catalog changed) is rebuilt on
+# a background thread; until it is done, pages show what is stored, if anything.
+# The vectors only depend on the catalog, so all engines (one per tenant)
+# share them.
+
+SUGGESTIONS_PER_CONTROL = 5
+SUGGESTIONS_SHOWN = 3
+MIN_SCORE = 0.05
+REBUILD_BATCH = 256
+TOKEN_RE = re.compile(r'[a-z]{3,}')
+STOPWORDS = frozenset("""
+    ante bajo cabe con contra desde durante entre hacia hasta mediante para por segun sin sobre tras
+    los las del una unos unas que como cual cuales cuando donde quien quienes cuyo cuya este esta
+    estos estas ese esa esos esas aquel sus suyo nuestro nuestra cada todo toda todos todas otro
+    otra otros otras mismo misma tal tales mas muy tambien pero sino aunque porque pues asi
+    ser son sera seran sido sea sean esta estan estar haber han hay debe deben deberan debera podra
+    podran puede pueden tiene tienen tener hace hacer dicho dicha dichos dichas presente the and for
+""".split())
+SUGGESTION_SCHEMA = """
+CREATE TABLE IF NOT EXISTS suggestions (
+    framework TEXT NOT NULL,
+    control_id TEXT NOT NULL,
+    document TEXT NOT NULL,
+    score REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_suggestions_control ON suggestions (framework, control_id, score);
+CREATE INDEX IF NOT EXISTS idx_suggestions_document ON suggestions (document);
+CREATE TABLE IF NOT EXISTS suggestion_builds (
+    framework TEXT PRIMARY KEY,
+    version TEXT NOT NULL
+);
+"""
+
+
+def tokenize(text):
+    # Lowercase, accents stripped, stopwords and words under 3 letters dropped.
+    text = unicodedata.normalize('NFKD', text.lower()).encode('ascii', 'ignore').decode('ascii')
+    return [token for token in TOKEN_RE.findall(text) if token not in STOPWORDS]
+
+
+def control_text(catalog, entry):
+    parts = [catalog.chapter_titles[entry.chapter], catalog.control_titles.get(entry.control, ''),
+             entry.title, entry.title, entry.content]  # the control's own title counts twice
+    return ' '.join(part for part in parts if part)
+
+
+class ControlVectors:
+    # TF-IDF matrix of one framework's controls (rows in catalog order).
+    def __init__(self, catalog):
+        self.version = catalog.version
+        self.ids = list(catalog.ids)
+        tokens = [Counter(tokenize(control_text(catalog, entry))) for entry in catalog]
+        self.vocabulary = {}
+        rows, cols, counts = [], [], []
+        for row, counter in enumerate(tokens):
+            for token, count in counter.items():
+                rows.append(row)
+                cols.append(self.vocabulary.setdefault(token, len(self.vocabulary)))
+                counts.append(count)
+        tf = np.zeros((len(self.ids), len(self.vocabulary)), dtype=np.float32)
+        tf[rows, cols] = counts
+        df = np.count_nonzero(tf, axis=0)
+        self.idf = (np.log((1 + len(self.ids)) / (1 + df)) + 1).astype(np.float32)
+        self.matrix = self._weigh(tf)
+
+    def _weigh(self, tf):
+        # Sublinear tf * idf, rows scaled to unit length so dot products are cosines.
+        weights = np.zeros_like(tf)
+        np.log(tf, out=weights, where=tf > 0)
+        weights[tf > 0] += 1
+        weights *= self.idf
+        norms = np.linalg.norm(weights, axis=1, keepdims=True)
+        return weights / np.where(norms > 0, norms, 1)
+
+    def vectorize(self, counters):
+        # counters: Counter(tokenize(text)) per document
+        tf = np.zeros((len(counters), len(self.vocabulary)), dtype=np.float32)
+        for row, counter in enumerate(counters):
+            for token, count in counter.items():
+                col = self.vocabulary.get(token)
+                if col is not None:
+                    tf[row, col] = count
+        return self._weigh(tf)
+
+    def score(self, counters):
+        # (documents x controls) cosine similarities
+        return self.vectorize(counters) @ self.matrix.T
+
+
+_vectors = {}
+_vectors_lock = threading.Lock()
+
+
+def control_vectors(catalog):
+    # Shared ControlVectors of the catalog's current version
+    with _vectors_lock:
+        vectors = _vectors.get(catalog.name)
+        if vectors is None or vectors.version != catalog.version:
+            vectors = _vectors[catalog.name] = ControlVectors(catalog)
+        return vectors
+
+
+class SuggestionEngine:
+    def __init__(self, search_index, frameworks):
+        self.search_index = search_index
+        self.frameworks = frameworks
+        self._local = threading.local()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='suggest')
+        self._lock = threading.Lock()
+        # framework -> whether to rebuild again once the running rebuild ends
+        self._rebuilding = {}
+        self._conn().executescript(SUGGESTION_SCHEMA)
+        search_index.listeners.append(self.add_document)
+
+    def _conn(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._local.conn = connect(self.search_index.path)
+        return conn
+
+    def vectors(self, framework):
+        catalog = self.frameworks.get(framework)
+        if catalog is None:
+            return None
+        return control_vectors(catalog)
+
+    def add_document(self, document, pages):
+        # Called by the search index once an upload's text is stored.
+        counter = Counter(tokenize(' '.join(text for number, text in pages)))
+        for framework in self.frameworks.names():
+            vectors = self.vectors(framework)
+            if not self._built(framework, vectors):
+                # The rebuild picks this document up as well; one already
+                # running may have read the texts before it, so it runs again.
+                self.schedule_rebuild(framework, again=True)
+                continue
+            self._store_document(framework, vectors, document, vectors.score([counter])[0])
+
+    def _built(self, framework, vectors):
+        rows = self._conn().execute('SELECT version FROM suggestion_builds WHERE framework = ?', (framework,)).fetchall()
+        return bool(rows) and rows[0]['version'] == vectors.version
+
+    def _store_document(self, framework, vectors, document, scores):
+        # Replaces the document's suggestions and trims the controls it now
+        # matches back to their best SUGGESTIONS_PER_CONTROL documents.
+        cols = np.nonzero(scores >= MIN_SCORE)[0]
+        controls = [vectors.ids[col] for col in cols]
+        conn = self._conn()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            conn.execute('DELETE FROM suggestions WHERE framework = ? AND document = ?', (framework, document))
+            conn.executemany('INSERT INTO suggestions (framework, control_id, document, score) VALUES (?, ?, ?, ?)',
+                             [(framework, control, document, float(scores[col]))
+                              for control, col in zip(controls, cols)])
+            conn.execute(
+                'DELETE FROM suggestions WHERE rowid IN ('
+                ' SELECT rowid FROM (SELECT rowid, ROW_NUMBER() OVER ('
+                '  PARTITION BY control_id ORDER BY score DESC) AS position'
+                '  FROM suggestions WHERE framework = ? AND control_id IN (SELECT value FROM json_each(?)))'
+                ' WHERE position > ?)',
+                (framework, json.dumps(controls), SUGGESTIONS_PER_CONTROL))
+            conn.execute('COMMIT')
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+
+    def schedule_rebuild(self, framework, again=False):
+        # rebuild() on the background thread, one at a time per framework
+        with self._lock:
+            if framework in self._rebuilding:
+                self._rebuilding[framework] = self._rebuilding[framework] or again
+                return
+            self._rebuilding[framework] = False
+        self._executor.submit(self._run_rebuild, framework)
+
+    def _run_rebuild(self, framework):
+        while True:
+            try:
+                self.rebuild(framework)
+            finally:
+                with self._lock:
+                    again = self._rebuilding.pop(framework)
+                    if again:
+                        self._rebuilding[framework] = False
+            if not again:
+                return
+
+    def close(self):
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+    def rebuild(self, framework):
+        # Scores every indexed document against the framework, REBUILD_BATCH
+        # documents per matrix product, keeping a running top
+        # SUGGESTIONS_PER_CONTROL per control, and writes the result at once.
+        # Runs when a framework is first used or its version changes.
+        vectors = self.vectors(framework)
+        names = []
+        top_scores = np.empty((0, len(vectors.ids)), dtype=np.float32)
+        top_documents = np.empty((0, len(vectors.ids)), dtype=np.int64)
+        batch = []
+
+        def merge():
+            nonlocal top_scores, top_documents
+            first = len(names)
+            names.extend(document for document, counter in batch)
+            scores = np.vstack([top_scores, vectors.score([counter for document, counter in batch])])
+            documents = np.vstack([top_documents, np.broadcast_to(
+                np.arange(first, len(names))[:, np.newaxis], (len(batch), len(vectors.ids)))])
+            best = np.argsort(-scores, axis=0, kind='stable')[:SUGGESTIONS_PER_CONTROL]
+            top_scores = np.take_along_axis(scores, best, axis=0)
+            top_documents = np.take_along_axis(documents, best, axis=0)
+            batch.clear()
+
+        for document, text in self.search_index.document_texts():
+            batch.append((document, Counter(tokenize(text))))
+            if len(batch) == REBUILD_BATCH:
+                merge()
+        if batch:
+            merge()
+
+        rows = [(framework, vectors.ids[col], names[top_documents[row, col]], float(top_scores[row, col]))
+                for row, col in zip(*np.nonzero(top_scores >= MIN_SCORE))]
+        conn = self._conn()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            conn.execute('DELETE FROM suggestions WHERE framework = ?', (framework,))
+            conn.executemany('INSERT INTO suggestions (framework, control_id, document, score) VALUES (?, ?, ?, ?)', rows)
+            conn.execute('INSERT OR REPLACE INTO suggestion_builds (framework, version) VALUES (?, ?)',
+                         (framework, vectors.version))
+            conn.execute('COMMIT')
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+
+    def for_framework(self, framework, shown=SUGGESTIONS_SHOWN, control_ids=None):
+        # {control_id: [(document, score), ...]} best first; control_ids
+        # limits it to those controls (e.g. one chapter)
+        vectors = self.vectors(framework)
+        if vectors is None:
+            return {}
+        if not self._built(framework, vectors):
+            # Served from whatever is stored meanwhile
+            self.schedule_rebuild(framework)
+        sql = 'SELECT control_id, document, score FROM suggestions WHERE framework = ?'
+        params = [framework]
+        if control_ids is not None:
+            sql += ' AND control_id IN (SELECT value FROM json_each(?))'
+            params.append(json.dumps(list(control_ids)))
+        suggestions = {}
+        for row in self._conn().execute(sql + ' ORDER BY control_id, score DESC', params):
+            documents = suggestions.setdefault(row['control_id'], [])
+            if len(documents) < shown:
+                documents.append((row['document'], round(row['score'], 2)))
+        return suggestions
@@ -0,0 +1,164 @@
+import json
+import os
+import re
+import threading
+from collections import OrderedDict
+
+# Tenants (organizations).  Every tenant has its own directory under tenants/
+# holding its database, uploads, search index, history and report cache; the
+# framework catalogs, compiled templates and other content-keyed caches are
+# shared.  A tenant's services are opened by the app's factory on its first
+# request and at most MAX_OPEN_TENANTS stay open, least recently used closed
+# first, so a request only ever opens its own tenant's files and costs the same
+# with one tenant or a thousand.  Requests hold the tenant they use (get ...
+# release) and only tenants nobody holds are closed, so there is never more
+# than one open copy of a tenant; the default tenant is never closed.  The default tenant lives in the working
+# directory, where single-tenant installs already keep their data.  Every
+# user may sign in to the default tenant; any other tenant only admits the
+# users listed in its members.json.
+
+TENANT_RE = re.compile(r'^[a-z0-9][a-z0-9_-]{0,62}$')
+DEFAULT_TENANT = 'default'
+TENANTS_FOLDER = 'tenants'
+MEMBERS_FILE = 'members.json'
+MAX_OPEN_TENANTS = int(os.environ.get('MAX_OPEN_TENANTS', 64))
+
+
+class UnknownTenant(Exception):
+    pass
+
+
+class TenantRegistry:
+    def __init__(self, factory, close=None, folder=TENANTS_FOLDER, max_open=MAX_OPEN_TENANTS):
+        # factory(name, root directory) -> the tenant's services;
+        # close(services) stops them once the tenant is evicted
+        self.factory = factory
+        self.close = close
+        self.folder = folder
+        self.max_open = max_open
+        self._lock = threading.Lock()
+        self._open = OrderedDict()
+        self._users = {}
+        self._opening = {}
+        self._closing = {}
+        self.opened = 0
+        self.closed = 0
+
+    def root(self, name):
+        return '.' if name == DEFAULT_TENANT else os.path.join(self.folder, name)
+
+    def exists(self, name):
+        if name == DEFAULT_TENANT:
+            return True
+        return bool(TENANT_RE.match(name or '')) and os.path.isdir(self.root(name))
+
+    def names(self):
+        names = [DEFAULT_TENANT]
+        if os.path.isdir(self.folder):
+            names += sorted(entry.name for entry in os.scandir(self.folder)
+                            if entry.is_dir() and TENANT_RE.match(entry.name) and entry.name != DEFAULT_TENANT)
+        return names
+
+    def members(self, name):
+        try:
+            with open(os.path.join(self.root(name), MEMBERS_FILE)) as f:
+                return set(json.load(f))
+        except FileNotFoundError:
+            return set()
+
+    def admits(self, name, username):
+        if name == DEFAULT_TENANT:
+            return True
+        return self.exists(name) and username in self.members(name)
+
+    def create(self, name, members=()):
+        # Creates the tenant if needed and adds members to it
+        if not TENANT_RE.match(name or '') or name == DEFAULT_TENANT:
+            raise ValueError(f'invalid tenant name: {name!r}')
+        os.makedirs(self.root(name), exist_ok=True)
+        path = os.path.join(self.root(name), MEMBERS_FILE)
+        tmp = path + '.tmp'
+        with open(tmp, 'w') as f:
+            json.dump(sorted(self.members(name) | set(members)), f)
+        os.replace(tmp, path)
+
+    def get(self, name):
+        # The tenant's services, held until release(name); the default tenant
+        # is never closed and needs no release.
+        with self._lock:
+            tenant = self._hold(name)
+            if tenant is not None:
+                return tenant
+            opening = self._opening.setdefault(name, threading.Lock())
+        # One thread opens a tenant; others asking for it meanwhile wait for it.
+        with opening:
+            with self._lock:
+                tenant = self._hold(name)
+                if tenant is not None:
+                    return tenant
+                closing = self._closing.get(name)
+            try:
+                if not self.exists(name):
+                    raise UnknownTenant(name)
+                # Its previous copy finishes its background work first
+                if closing is not None:
+                    closing.join()
+                tenant = self.factory(name, self.root(name))
+            finally:
+                with self._lock:
+                    self._opening.pop(name, None)
+            with self._lock:
+                self._open[name] = tenant
+                self.opened += 1
+                self._hold(name)
+                self._evict()
+        return tenant
+
+    def release(self, name):
+        with self._lock:
+            if name in self._users:
+                self._users[name] -= 1
+                if not self._users[name]:
+                    del self._users[name]
+            self._evict()
+
+    def _hold(self, name):
+        tenant = self._open.get(name)
+        if tenant is not None:
+            self._open.move_to_end(name)
+            if name != DEFAULT_TENANT:
+                self._users[name] = self._users.get(name, 0) + 1
+        return tenant
+
+    def _evict(self):
+        # Least recently used tenants nobody holds, while too many are open;
+        # held ones stay open past max_open until released.  Each is closed on
+        # its own thread, so requests don't wait for its queued index and
+        # report jobs; reopening it does (see get).
+        for name in list(self._open):
+            if len(self._open) <= self.max_open:
+                break
+            if name != DEFAULT_TENANT and name not in self._users:
+                tenant = self._open.pop(name)
+                self.closed += 1
+                if self.close is not None:
+                    thread = threading.Thread(target=self._run_close, args=(name, tenant), daemon=True)
+                    self._closing[name] = thread
+                    thread.start()
+
+    def _run_close(self, name, tenant):
+        try:
+            self.close(tenant)
+        finally:
+            with self._lock:
+                if self._closing.get(name) is threading.current_thread():
+                    del self._closing[name]
+
+    def open_tenants(self):
+        with self._lock:
+            return list(self._open.values())
+
+    def stats(self):
+        with self._lock:
+            return {'open': len(self._open), 'in_use': len(self._users), 'closing': len(self._closing),
+                    'opened': self.opened, 'closed': self.closed, 'max_open': self.max_open}
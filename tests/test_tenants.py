@@ -0,0 +1,90 @@
+import importlib
+import io
+import os
+import sys
+
+import pytest
+from reportlab.pdfgen import canvas
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture(scope='module')
+def audit_app(tmp_path_factory):
+    # The app keeps its data in the working directory
+    cwd = os.getcwd()
+    os.chdir(tmp_path_factory.mktemp('audit'))
+    try:
+        module = importlib.import_module('app')
+        module.app.config['TESTING'] = True
+        module.tenants.create('acme', ['user'])
+        module.tenants.create('globex', ['auditor'])
+        yield module
+    finally:
+        os.chdir(cwd)
+
+
+def pdf(text):
+    data = io.BytesIO()
+    page = canvas.Canvas(data)
+    page.drawString(100, 700, text)
+    page.showPage()
+    page.save()
+    data.seek(0)
+    return data
+
+
+def upload(client, name):
+    response = client.post('/upload', data={'file': (pdf(name), name)}, content_type='multipart/form-data')
+    assert response.status_code == 302
+
+
+def login(client, username, organization):
+    client.get('/logout')
+    return client.post('/login', data={'username': username, 'password': username,
+                                       'organization': organization})
+
+
+def test_member_signs_in_to_own_tenant(audit_app):
+    client = audit_app.app.test_client()
+    response = login(client, 'user', 'acme')
+    assert response.status_code == 302
+    with client.session_transaction() as session:
+        assert session['tenant'] == 'acme'
+
+
+def test_user_cannot_open_another_tenant(audit_app):
+    client = audit_app.app.test_client()
+    login(client, 'user', 'acme')
+    upload(client, 'acme.pdf')
+    assert b'acme.pdf' in client.get('/documents').data
+
+    response = login(client, 'user', 'globex')
+    assert response.status_code == 200
+    assert b'Invalid credentials' in response.data
+    with client.session_transaction() as session:
+        assert 'username' not in session and 'tenant' not in session
+
+    # A tenant that does not exist fails the same way
+    response = login(client, 'user', 'initech')
+    assert b'Invalid credentials' in response.data
+
+    login(client, 'auditor', 'globex')
+    response = client.get('/documents')
+    assert b'acme.pdf' not in response.data
+    assert client.get('/download/acme.pdf').status_code == 404
+
+
+def test_every_user_signs_in_to_default_tenant(audit_app):
+    client = audit_app.app.test_client()
+    for username in audit_app.USERS:
+        assert login(client, username, '').status_code == 302
+
+
+def test_download_requires_login(audit_app):
+    client = audit_app.app.test_client()
+    login(client, 'user', 'acme')
+    upload(client, 'own.pdf')
+    assert client.get('/download/own.pdf').status_code == 200
+    client.get('/logout')
+    assert client.get('/download/own.pdf').status_code == 302